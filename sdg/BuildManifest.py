@@ -0,0 +1,202 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from sdg.Loggable import Loggable
+
+class BuildManifest(Loggable):
+    """Record hashes of the indicators written to a folder.
+
+    The manifest is saved alongside the output files, so that a later build
+    into the same folder can skip any indicators whose content has not
+    changed since they were last written.
+    """
+
+
+    def __init__(self, folder, settings=None, filename='build-manifest.json',
+                 logging=None):
+        """Constructor for the BuildManifest class.
+
+        Parameters
+        ----------
+        folder : string
+            The folder where the output files (and the manifest) are written.
+        settings : dict or None
+            Any output configuration that affects all of the files. If these
+            settings change, all indicators are considered to have changed.
+        filename : string
+            The filename of the manifest within the folder.
+        """
+        Loggable.__init__(self, logging=logging)
+        self.folder = folder
+        self.path = os.path.join(folder, filename)
+        self.settings_hash = self.hash_object(settings)
+        self.previous = self.read()
+        self.indicators = {}
+
+
+    def read(self):
+        """Read the manifest from a previous build, if any.
+
+        Returns
+        -------
+        dict
+            The previous manifest, or an empty manifest.
+        """
+        empty = {'settings': None, 'indicators': {}, 'aggregates': False}
+        if not os.path.isfile(self.path):
+            return empty
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            self.warn('Unable to read build manifest {path}: {error}', path=self.path, error=str(e))
+            return empty
+        if manifest.get('settings') != self.settings_hash:
+            self.debug('Output settings have changed, so all indicators will be rebuilt.')
+            # Remember which indicators were written, but not their hashes.
+            empty['indicators'] = {indicator_id: None for indicator_id in manifest.get('indicators', {})}
+            return empty
+        return manifest
+
+
+    def write(self, aggregates=True):
+        """Save the manifest for the next build.
+
+        Parameters
+        ----------
+        aggregates : boolean
+            Whether the aggregate files (all indicators together) were
+            successfully written.
+        """
+        manifest = {
+            'settings': self.settings_hash,
+            'indicators': self.indicators,
+            'aggregates': aggregates,
+        }
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+    def is_unchanged(self, indicator_id, indicator_hash):
+        """Whether an indicator has the same hash as in the previous build.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        indicator_hash : string
+            The hash of the indicator in the current build.
+
+        Returns
+        -------
+        boolean
+        """
+        return self.previous['indicators'].get(indicator_id) == indicator_hash
+
+
+    def get_removed_indicator_ids(self, indicator_ids):
+        """Get the indicators from the previous build which are no longer present.
+
+        Parameters
+        ----------
+        indicator_ids : list
+            The ids of the indicators in the current build.
+
+        Returns
+        -------
+        list
+            The ids of the indicators which were previously written, but are
+            not in indicator_ids.
+        """
+        current = set(indicator_ids)
+        return [indicator_id for indicator_id in self.previous['indicators'] if indicator_id not in current]
+
+
+    def set_indicator_hash(self, indicator_id, indicator_hash):
+        """Record the hash of an indicator that is now up to date.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        indicator_hash : string
+            The hash of the indicator in the current build.
+        """
+        self.indicators[indicator_id] = indicator_hash
+
+
+    def aggregates_unchanged(self):
+        """Whether the aggregate files would be identical to the previous build.
+
+        This is only the case if exactly the same indicators, with the same
+        hashes, were recorded in both builds.
+
+        Returns
+        -------
+        boolean
+        """
+        return self.previous['aggregates'] == True and self.previous['indicators'] == self.indicators
+
+
+    def get_indicator_hash(self, indicator):
+        """Compute a hash of everything that gets written for an indicator.
+
+        Parameters
+        ----------
+        indicator : Indicator
+            The (possibly translated) indicator.
+
+        Returns
+        -------
+        string
+            A hexadecimal hash.
+        """
+        # The headline and edges are derived from the data and options, which
+        # are covered by the fingerprint.
+        return indicator.get_fingerprint()
+
+
+    @staticmethod
+    def hash_dataframe(df):
+        """Compute a hash of a DataFrame, including its columns and types.
+
+        Parameters
+        ----------
+        df : DataFrame or None
+
+        Returns
+        -------
+        string
+            A hexadecimal hash.
+        """
+        hasher = hashlib.sha256()
+        if df is None:
+            return hasher.hexdigest()
+        hasher.update(json.dumps([str(column) for column in df.columns]).encode('utf-8'))
+        hasher.update(json.dumps([str(dtype) for dtype in df.dtypes]).encode('utf-8'))
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=False).values
+            hasher.update(row_hashes.tobytes())
+        except TypeError:
+            # Unhashable cell values (like lists) fall back to a CSV rendering.
+            hasher.update(df.to_csv(index=False).encode('utf-8'))
+        return hasher.hexdigest()
+
+
+    @staticmethod
+    def hash_object(obj):
+        """Compute a hash of a JSON-like object, independent of key order.
+
+        Parameters
+        ----------
+        obj : dict, list, string, etc.
+
+        Returns
+        -------
+        string
+            A hexadecimal hash.
+        """
+        serialized = json.dumps(obj, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import threading
+from sdg.Loggable import Loggable
+from sdg.logs.LogSinkBase import LogSinkBase
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows.
+    resource = None
+
+class BuildProfiler(Loggable, LogSinkBase):
+    """Record the time and peak memory of the stages of a build.
+
+    Once activated, this receives the spans of all Loggable objects (see
+    Loggable.span). The results can be written to a JSON file.
+    """
+
+
+    spans = True
+    # Span fields which are not copied into the stages of the report.
+    span_fields = set(['type', 'name', 'category', 'class_name', 'start', 'end',
+                       'duration_ms', 'id', 'parent', 'depth', 'thread'])
+
+
+    def __init__(self, top_indicators=10, logging=None):
+        """Constructor for the BuildProfiler class.
+
+        Parameters
+        ----------
+        top_indicators : int
+            The number of slowest indicators to include in the report.
+        """
+        Loggable.__init__(self, logging=logging)
+        self.top_indicators = top_indicators
+        self.stages = []
+        self.indicators = {}
+        self.lock = threading.Lock()
+        self.start_time = None
+
+
+    def activate(self):
+        """Start receiving spans from all Loggable objects."""
+        self.start_time = time.time()
+        Loggable.add_sink(self)
+
+
+    def deactivate(self):
+        """Stop receiving spans."""
+        Loggable.remove_sink(self)
+
+
+    def write_span(self, record, indicator=None):
+        """Record a finished span (see LogSinkBase.write_span)."""
+        seconds = record['duration_ms'] / 1000
+        if indicator is not None:
+            self.add_indicator_time(indicator, record['name'], seconds)
+            return
+        stage = {
+            'name': record['name'],
+            'category': record['category'],
+            'start': round(record['start'] - self.start_time, 6) if self.start_time is not None else None,
+            'seconds': round(seconds, 6),
+            'peak_rss_kb': self.get_peak_rss(),
+            'thread': record['thread'],
+        }
+        for key in record:
+            if key not in BuildProfiler.span_fields:
+                stage[key] = record[key]
+        with self.lock:
+            self.stages.append(stage)
+
+
+    def add_indicator_time(self, indicator, task, seconds):
+        """Add time spent on a particular indicator.
+
+        Parameters
+        ----------
+        indicator : Indicator
+            The indicator that was worked on.
+        task : string
+            A short name for the work, such as "translate" or "write".
+        seconds : float
+            The time spent.
+        """
+        indicator_id = indicator.inid
+        with self.lock:
+            if indicator_id not in self.indicators:
+                self.indicators[indicator_id] = {
+                    'seconds': 0,
+                    'tasks': {},
+                    'indicator': indicator,
+                }
+            info = self.indicators[indicator_id]
+            info['seconds'] += seconds
+            info['tasks'][task] = info['tasks'].get(task, 0) + seconds
+
+
+    def get_slowest_indicators(self):
+        """Get the indicators which took the most time.
+
+        Returns
+        -------
+        list
+            List of dicts containing the id, time, and size of the indicators.
+        """
+        with self.lock:
+            items = list(self.indicators.items())
+        items.sort(key=lambda item: item[1]['seconds'], reverse=True)
+        slowest = []
+        for indicator_id, info in items[:self.top_indicators]:
+            data = info['indicator'].data
+            slowest.append({
+                'indicator_id': indicator_id,
+                'seconds': round(info['seconds'], 6),
+                'tasks': {task: round(seconds, 6) for task, seconds in info['tasks'].items()},
+                'rows': 0 if data is None else len(data),
+                'columns': 0 if data is None else len(data.columns),
+            })
+        return slowest
+
+
+    def get_report(self):
+        """Get all of the profiling information.
+
+        Returns
+        -------
+        dict
+            The profiling report, suitable for JSON.
+        """
+        total = None
+        if self.start_time is not None:
+            total = round(time.time() - self.start_time, 6)
+        with self.lock:
+            stages = list(self.stages)
+        return {
+            'total_seconds': total,
+            'peak_rss_kb': self.get_peak_rss(),
+            'stages': stages,
+            'slowest_indicators': self.get_slowest_indicators(),
+        }
+
+
+    def write(self, path):
+        """Write the profiling report to a JSON file.
+
+        Parameters
+        ----------
+        path : string
+            The path to the JSON file.
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_report(), f, indent=2)
+
+
+    @staticmethod
+    def get_peak_rss():
+        """Get the peak resident memory of this process so far.
+
+        Returns
+        -------
+        int or None
+            The peak memory in kilobytes, or None if unavailable.
+        """
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # On macOS this is reported in bytes rather than kilobytes.
+        if sys.platform == 'darwin':
+            peak = peak // 1024
+        return peak
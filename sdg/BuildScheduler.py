@@ -0,0 +1,124 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from sdg.Loggable import Loggable
+
+class BuildScheduler(Loggable):
+    """Run the steps of a build concurrently, respecting their dependencies.
+
+    Each task is a callable that takes no arguments. A task only starts once
+    all of the tasks it depends on have finished. If a task returns False the
+    overall status of the build is False, but dependent tasks still run, in the
+    same way that a serial build carries on after a failed output.
+    """
+
+
+    def __init__(self, max_workers=1, logging=None):
+        """Constructor for the BuildScheduler class.
+
+        Parameters
+        ----------
+        max_workers : int
+            The maximum number of tasks to run at the same time. With the
+            default of 1 the tasks run one after another, in the order they
+            were added.
+        """
+        Loggable.__init__(self, logging=logging)
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.dependencies = {}
+        self.timings = {}
+
+
+    def add_task(self, name, task, depends_on=None):
+        """Add a task to the schedule.
+
+        Parameters
+        ----------
+        name : string
+            A unique name for the task.
+        task : function
+            A callable with no arguments. A return value of False indicates
+            that the task failed.
+        depends_on : list or None
+            The names of previously-added tasks that must finish first.
+        """
+        if name in self.tasks:
+            raise KeyError('A task called "' + name + '" has already been added.')
+        if depends_on is None:
+            depends_on = []
+        for dependency in depends_on:
+            if dependency not in self.tasks:
+                raise KeyError('The task "' + name + '" depends on unknown task "' + dependency + '".')
+        self.tasks[name] = task
+        self.dependencies[name] = list(depends_on)
+
+
+    def run(self):
+        """Run all of the tasks.
+
+        Returns
+        -------
+        boolean
+            False if any of the tasks returned False, otherwise True.
+        """
+        self.timings = {}
+        if self.max_workers is None or self.max_workers <= 1:
+            status = True
+            for name in self.tasks:
+                status = self.run_task(name) & status
+            return status
+
+        status = True
+        finished = set()
+        pending = list(self.tasks.keys())
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready = [name for name in pending if all(dependency in finished for dependency in self.dependencies[name])]
+                for name in ready:
+                    if len(running) >= self.max_workers:
+                        break
+                    pending.remove(name)
+                    running[pool.submit(self.run_task, name)] = name
+                if not running:
+                    raise ValueError('Unable to schedule tasks: ' + ', '.join(pending))
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    status = future.result() & status
+                    finished.add(name)
+
+        return status
+
+
+    def run_task(self, name):
+        """Run a single task and record how long it took.
+
+        Parameters
+        ----------
+        name : string
+            The name of the task to run.
+
+        Returns
+        -------
+        boolean
+            The status of the task.
+        """
+        self.debug('Starting task: {name}', name=name)
+        start = time.perf_counter()
+        with self.span('Task: ' + name, category='task'):
+            result = self.tasks[name]()
+        self.timings[name] = time.perf_counter() - start
+        self.debug('Finished task: {name} ({seconds:.3f}s)', name=name, seconds=self.timings[name])
+        return result is not False
+
+
+    def get_timings(self):
+        """Get the durations of the tasks that have run.
+
+        Returns
+        -------
+        dict
+            Durations in seconds, keyed by task name.
+        """
+        return self.timings
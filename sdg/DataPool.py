@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from sdg.Loggable import Loggable
+
+class DataPool(Loggable):
+    """A size-limited pool of loaded objects, such as indicator DataFrames.
+
+    Objects are loaded on demand, and the least recently used objects are
+    discarded once the pool is full. Anything discarded will simply be loaded
+    again the next time it is needed.
+    """
+
+
+    def __init__(self, max_size=100, logging=None):
+        """Constructor for the DataPool class.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of objects to keep loaded at the same time.
+        """
+        Loggable.__init__(self, logging=logging)
+        if max_size < 1:
+            raise ValueError('The max_size of a DataPool must be at least 1.')
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.num_loads = 0
+
+
+    def get(self, key, loader):
+        """Get an object from the pool, loading it if necessary.
+
+        Parameters
+        ----------
+        key : hashable
+            A unique key for the object.
+        loader : function
+            A function with no arguments, which returns the object.
+
+        Returns
+        -------
+        mixed
+            The loaded object.
+        """
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                return self.items[key]
+        # Load outside of the lock, so that loaders can use the pool too.
+        value = loader()
+        with self.lock:
+            self.num_loads += 1
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                evicted_key, _ = self.items.popitem(last=False)
+                self.debug('Evicted {key} from data pool', key=evicted_key)
+        return value
+
+
+    def discard(self, key):
+        """Remove an object from the pool, if it is there.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the object.
+        """
+        with self.lock:
+            self.items.pop(key, None)
+
+
+    def __len__(self):
+        return len(self.items)
@@ -67,8 +67,7 @@ class DisaggregationReportService(Loggable):
                 continue
             non_disaggregation_columns = indicators[indicator_id].options.get_non_disaggregation_columns()
             non_disaggregation_columns = [col for col in non_disaggregation_columns if col not in self.extra_disaggregations]
-            for series in indicators[indicator_id].get_all_series():
-                disaggregations = series.get_disaggregations()
+            for disaggregations in indicators[indicator_id].iter_series_disaggregations():
                 for disaggregation in disaggregations:
                     if disaggregation in non_disaggregation_columns:
                         continue
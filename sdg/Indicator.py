@@ -1,5 +1,6 @@
-import copy
 import json
+import hashlib
+import itertools
 import sdg
 import pandas as pd
 import numpy as np
@@ -10,7 +11,11 @@ from sdg.Loggable import Loggable
 class Indicator(Loggable):
     """Data model for SDG indicators."""
 
-    def __init__(self, inid, name=None, data=None, meta=None, options=None, logging=None):
+    # Unique keys for the entries of lazy indicators in a DataPool.
+    pool_keys = itertools.count()
+
+    def __init__(self, inid, name=None, data=None, meta=None, options=None, logging=None,
+                 data_loader=None, data_pool=None):
         """Constructor for the SDG indicator instances.
 
         Parameters
@@ -25,20 +30,163 @@ class Indicator(Loggable):
             Dict of fielded metadata.
         options : IndicatorOptions
             Output-specific options provided by the OutputBase class.
+        data_loader : function or None
+            Optional function returning the data, for loading it lazily. This
+            is only used if data is None. The data will be loaded when needed,
+            and kept in the data_pool along with the headline and edges.
+        data_pool : DataPool or None
+            The pool holding lazily-loaded data. Required with data_loader.
         """
         Loggable.__init__(self, logging=logging)
         self.inid = inid
         self.name = name
-        self.data = data
+        self.data_loader = data_loader if data is None else None
+        self.data_pool = data_pool
+        self.pool_key = next(Indicator.pool_keys)
         self.meta = meta
         self.options = sdg.IndicatorOptions() if options is None else options
-        self.set_headline()
-        self.set_edges()
+        self._data = self.categorize_data(data)
+        self._headline = None
+        self._edges = None
+        self._null_patterns = None
+        self._fingerprint = None
+        self.require_data()
         self.translations = {}
         self.serieses = {}
         self.data_matching_schema = {}
 
 
+    @property
+    def data(self):
+        """The data for this indicator, loading it if necessary."""
+        if self.is_lazy():
+            return self.data_pool.get((self.pool_key, 'data'), self.load_data)
+        return self._data
+
+
+    @data.setter
+    def data(self, val):
+        # Explicitly setting the data means it is no longer lazily loaded.
+        if self.is_lazy():
+            self.data_loader = None
+            for kind in ['data', 'headline', 'edges', 'null_patterns']:
+                self.data_pool.discard((self.pool_key, kind))
+            self.data_pool = None
+        self._data = val
+        # The headline, edges and fingerprint are recalculated when next needed.
+        self._headline = None
+        self._edges = None
+        self._null_patterns = None
+        self._fingerprint = None
+
+
+    @property
+    def headline(self):
+        """The headline for this indicator, calculated once per dataset."""
+        if self._headline is None:
+            if self.is_lazy():
+                return self.data_pool.get((self.pool_key, 'headline'), self.calculate_headline)
+            self._headline = self.calculate_headline()
+        return self._headline
+
+
+    @headline.setter
+    def headline(self, val):
+        self._headline = val
+
+
+    @property
+    def edges(self):
+        """The edges for this indicator, calculated once per dataset."""
+        if self._edges is None:
+            if self.is_lazy():
+                return self.data_pool.get((self.pool_key, 'edges'), self.calculate_edges)
+            self._edges = self.calculate_edges()
+        return self._edges
+
+
+    @edges.setter
+    def edges(self, val):
+        self._edges = val
+
+
+    @property
+    def null_patterns(self):
+        """The NullPatterns of the data for this indicator, calculated once per dataset."""
+        if self._null_patterns is None:
+            if self.is_lazy():
+                return self.data_pool.get((self.pool_key, 'null_patterns'), self.calculate_null_patterns)
+            self._null_patterns = self.calculate_null_patterns()
+        return self._null_patterns
+
+
+    @null_patterns.setter
+    def null_patterns(self, val):
+        self._null_patterns = val
+
+
+    def load_data(self):
+        """Load the data for a lazy indicator."""
+        return self.categorize_data(self.data_loader())
+
+
+    def categorize_data(self, data):
+        """Store the text columns of some data as pandas Categoricals.
+
+        This is controlled by IndicatorOptions.set_categorical_columns().
+
+        Parameters
+        ----------
+        data : DataFrame or None
+            The data to convert.
+
+        Returns
+        -------
+        DataFrame or None
+            The converted data.
+        """
+        if data is None or not self.options.get_categorical_columns():
+            return data
+        non_categorical_columns = ['Year', 'Value']
+        columns = {column: 'category' for column in data.columns
+                   if column not in non_categorical_columns and data[column].dtype == object}
+        if not columns:
+            return data
+        try:
+            return data.astype(columns)
+        except TypeError:
+            # Some values (such as lists) cannot be categorized.
+            return data
+
+
+    def is_lazy(self):
+        """Check to see if the data for this indicator is loaded lazily.
+
+        Returns
+        -------
+        boolean
+            True if the data is loaded on demand, through a DataPool.
+        """
+        return self.data_loader is not None
+
+
+    def __getstate__(self):
+        # Lazy loaders may not be picklable, so include the loaded data instead.
+        state = self.__dict__.copy()
+        if self.is_lazy():
+            state['_data'] = self.data
+            state['_headline'] = self.headline
+            state['_edges'] = self.edges
+            state['data_loader'] = None
+        state['data_pool'] = None
+        # Leave out the translations and anything which can be calculated again,
+        # to keep pickles (such as those sent to process workers) small.
+        state['translations'] = {}
+        state['_null_patterns'] = None
+        state['data_matching_schema'] = {}
+        return state
+
+
     def has_name(self):
         """Check to see if the indicator has a name.
 
@@ -65,6 +213,7 @@ class Indicator(Loggable):
         """Set the name of the indicator."""
         if name is not None:
             self.name = name
+            self._fingerprint = None
 
 
     def has_data(self):
@@ -100,18 +249,33 @@ class Indicator(Loggable):
         ----------
         val : Dataframe or None
         """
-        # If empty or None, do nothing.
-        if val is None or not isinstance(val, pd.DataFrame) or val.empty:
+        self.add_data([val])
+
+
+    def add_data(self, vals):
+        """Append several pieces of data at once, such as from several inputs.
+
+        This concatenates everything in one go, which is much faster than
+        calling set_data() for each piece.
+
+        Parameters
+        ----------
+        vals : list
+            A list of Dataframes. Any which are empty or None are ignored.
+        """
+        # Ignore anything empty or None.
+        vals = [val for val in vals if val is not None and isinstance(val, pd.DataFrame) and not val.empty]
+        if not vals:
             return
 
         if self.has_data():
-            self.data = pd.concat([self.data, val], sort=False)
+            vals = [self.data] + vals
+        if len(vals) > 1:
+            # Categoricals with different categories concatenate as objects.
+            self.data = self.categorize_data(pd.concat(vals, sort=False))
             self.enforce_column_order()
         else:
-            self.data = val
-
-        self.set_headline()
-        self.set_edges()
+            self.data = self.categorize_data(vals[0])
 
 
     def set_meta(self, val):
@@ -126,6 +290,7 @@ class Indicator(Loggable):
                 self.meta = self.deepUpdate(self.meta, val)
             else:
                 self.meta = val
+            self._fingerprint = None
 
 
     def deepUpdate(self, d, u):
@@ -139,27 +304,85 @@ class Indicator(Loggable):
 
 
     def set_headline(self):
-        """Calculate and set the headline for this indicator."""
+        """Recalculate the headline for this indicator when next needed.
+
+        This is only necessary if the data was changed in place, because
+        setting the data does this automatically.
+        """
         self.require_data()
+        self.headline = None
+        self.clear_null_patterns()
+        if self.is_lazy():
+            self.data_pool.discard((self.pool_key, 'headline'))
+
+
+    def calculate_headline(self):
+        """Calculate the headline for this indicator.
+
+        Returns
+        -------
+        Dataframe
+            The headline data.
+        """
         non_disaggregation_columns = self.options.get_non_disaggregation_columns()
-        self.headline = sdg.data.filter_headline(self.data, non_disaggregation_columns)
+        return sdg.data.filter_headline(self.data, non_disaggregation_columns, self.null_patterns)
 
 
     def has_headline(self):
         """Report whether this indicator has a headline."""
-        return hasattr(self, 'headline') and not self.headline.empty
+        return self.headline is not None and not self.headline.empty
 
 
     def set_edges(self):
-        """Calculate and set the edges for this indicator."""
+        """Recalculate the edges for this indicator when next needed.
+
+        This is only necessary if the data was changed in place, because
+        setting the data does this automatically.
+        """
         self.require_data()
+        self.edges = None
+        self.clear_null_patterns()
+        if self.is_lazy():
+            self.data_pool.discard((self.pool_key, 'edges'))
+
+
+    def calculate_edges(self):
+        """Calculate the edges for this indicator.
+
+        Returns
+        -------
+        Dataframe
+            The edges data.
+        """
         non_disaggregation_columns = self.options.get_non_disaggregation_columns()
-        self.edges = sdg.edges.edge_detection(self.inid, self.data, non_disaggregation_columns)
+        return sdg.edges.edge_detection(self.inid, self.data, non_disaggregation_columns, self.null_patterns)
 
 
     def has_edges(self):
         """Report whether this indicator has edges."""
-        return hasattr(self, 'edges') and not self.edges.empty
+        return self.edges is not None and not self.edges.empty
+
+
+    def clear_null_patterns(self):
+        """Recalculate the null patterns for this indicator when next needed.
+
+        This is only necessary if the data was changed in place, because
+        setting the data does this automatically.
+        """
+        self.null_patterns = None
+        if self.is_lazy():
+            self.data_pool.discard((self.pool_key, 'null_patterns'))
+
+
+    def calculate_null_patterns(self):
+        """Calculate the null patterns for this indicator.
+
+        Returns
+        -------
+        NullPatterns
+            The patterns of empty cells in the data.
+        """
+        return sdg.NullPatterns.from_dataframe(self.data)
 
 
     def get_goal_id(self):
@@ -223,10 +446,13 @@ class Indicator(Loggable):
             for key in minimum_metadata:
                 if key not in self.meta:
                     self.meta[key] = minimum_metadata[key]
+        self._fingerprint = None
 
 
     def require_data(self):
         """Ensure at least an empty dataset for this indicator."""
+        if self.is_lazy():
+            return
         if self.data is None:
             df = pd.DataFrame({'Year':[], 'Value':[]})
             # Enforce the order of columns.
@@ -250,6 +476,15 @@ class Indicator(Loggable):
     def translate(self, language, translation_helper):
         """Translate the entire indicator into a particular language.
 
+        The translated metadata does not share any lists or dicts with this
+        indicator, so it can be changed freely. But to save memory, any data
+        columns which translation does not change (such as Year and Value) are
+        shared with this indicator. So the translated data should be treated
+        as read-only: to change a column, assign a new one (for example,
+        data['Value'] = data['Value'] * 2) rather than altering it in place
+        (for example, with data.loc or "*="), which would also change this
+        indicator and every other language.
+
         Parameters
         ----------
         language : string
@@ -264,7 +499,8 @@ class Indicator(Loggable):
         # Start with an empty indicator.
         indicator = Indicator(inid=self.inid, options=self.options)
 
-        # Translation callbacks for below.
+        # Translation callbacks for below. Lists and dicts are always rebuilt,
+        # so the translated metadata does not share them with this indicator.
         def translate_meta(text):
             # Recursively handle lists.
             if isinstance(text, list):
@@ -274,8 +510,6 @@ class Indicator(Loggable):
                 return {key: translate_meta(value) for (key, value) in text.items()}
             # Otherwise treat as a string.
             return translation_helper.translate(text, language, default_group='data')
-        def translate_data(text, column):
-            return translation_helper.translate(text, language, default_group=[column, 'data'])
         def translate_data_columns(text):
             # We only want to translate disaggregation columns, for the most part. However,
             # a special case is the COMPOSITE_BREAKDOWN disaggregation, often found in SDMX.
@@ -291,7 +525,7 @@ class Indicator(Loggable):
 
         # Translate the metadata.
         if self.meta is not None:
-            meta_copy = copy.deepcopy(self.meta)
+            meta_copy = dict(self.meta)
             # But first do overrides of "subfolder" metadata.
             if language in meta_copy and isinstance(meta_copy[language], dict):
                 meta_copy.update(meta_copy[language])
@@ -301,10 +535,20 @@ class Indicator(Loggable):
                 meta_copy[key] = translate_meta(meta_copy[key])
             indicator.set_meta(meta_copy)
 
-        # Translate the data cells and headers.
-        data_copy = copy.deepcopy(self.data)
-        for column in data_copy:
-            data_copy[column] = data_copy[column].apply(lambda x: translate_data(x, column))
+        # Translate the data cells and headers. Columns which do not change are
+        # shared with this indicator rather than copied.
+        data = self.data
+        new_nulls = False
+        if len(data.columns) > 0:
+            translated_series = []
+            for column in data:
+                series, column_new_nulls = translation_helper.translate_series(data[column], language,
+                    default_group=[column, 'data'], return_new_nulls=True)
+                translated_series.append(series)
+                new_nulls = new_nulls or column_new_nulls
+            data_copy = pd.concat(translated_series, axis=1, copy=False)
+        else:
+            data_copy = data.copy()
         data_copy.rename(mapper=translate_data_columns, axis='columns', inplace=True)
 
         # Because the above could result in duplicate columns, fix that now.
@@ -312,13 +556,70 @@ class Indicator(Loggable):
             s = pd.Series(data_copy.columns)
             data_copy.columns = data_copy.columns+s.groupby(s).cumcount().replace(0,'').astype(str)
 
-
         indicator.set_data(data_copy)
+        translated_columns = dict(zip(data.columns, data_copy.columns))
+        # Unless some values were translated into nothing, the empty cells are
+        # the same as in this indicator. Then the null patterns are shared,
+        # with the translated column names, and the headline is selected from
+        # these without checking any cells. Otherwise they are found again.
+        same_empty_cells = not data_copy.empty and not new_nulls
+        if same_empty_cells:
+            indicator.null_patterns = self.null_patterns.rename(translated_columns)
+            # The edges only depend on the empty cells too, so they can simply
+            # be translated, as long as the disaggregation columns are the same.
+            # Otherwise they are detected again.
+            non_disaggregation_columns = self.options.get_non_disaggregation_columns()
+            if all((column in non_disaggregation_columns) == (translated_columns[column] in non_disaggregation_columns)
+                   for column in translated_columns):
+                indicator.edges = self.edges.apply(lambda edge_column: edge_column.map(translated_columns))
 
         # Finally place the translation for later access.
         self.translations[language] = indicator
 
 
+    def get_fingerprint(self):
+        """Get a hash of the content of this indicator, for detecting changes.
+
+        The hash covers the id, name, metadata, data and options. It is only
+        calculated once, until any of these are set again. If the data or
+        metadata are changed in place, call clear_fingerprint() afterwards.
+
+        Returns
+        -------
+        string
+            A hexadecimal hash.
+        """
+        if self._fingerprint is None:
+            hasher = hashlib.sha256()
+            content = [self.inid, self.name, self.meta, vars(self.options)]
+            hasher.update(sdg.BuildManifest.hash_object(content).encode('utf-8'))
+            hasher.update(sdg.BuildManifest.hash_dataframe(self.data).encode('utf-8'))
+            self._fingerprint = hasher.hexdigest()
+        return self._fingerprint
+
+
+    def clear_fingerprint(self):
+        """Recalculate the fingerprint for this indicator when next needed.
+
+        This is only necessary if the data or metadata were changed in place.
+        """
+        self._fingerprint = None
+
+
+    def clear_translations(self, language=None):
+        """Forget translated copies of this indicator, to free up memory.
+
+        Parameters
+        ----------
+        language : string or None
+            The language code to forget. If None, all languages are forgotten.
+        """
+        if language is None:
+            self.translations = {}
+        else:
+            self.translations.pop(language, None)
+
+
     def is_complete(self):
         """Decide whether this indicator can be considered "complete".
 
@@ -436,14 +737,9 @@ class Indicator(Loggable):
         if language in self.serieses and use_cache:
             return self.serieses[language]
 
-        # Assume "disaggregations" are everything except 'Year' and 'Value'.
-        aggregating_columns = ['Year', 'Value']
-        observation_attributes = self.options.get_observation_attributes()
-        for col in observation_attributes:
-            if col in self.data.columns:
-                aggregating_columns.append(col)
-
-        grouping_columns = [column for column in self.data.columns if column not in aggregating_columns]
+        observation_attributes = [column for column in self.options.get_observation_attributes()
+                                  if column in self.data.columns]
+        data, grouping_columns, order, starts = self.get_series_groups()
 
         if len(grouping_columns) == 0:
             series = sdg.Series({}, self.get_indicator_id(), logging=self.logging)
@@ -454,28 +750,82 @@ class Indicator(Loggable):
                         series.add_observation_attribute(row['Year'], attribute, row[attribute])
             return [series]
 
-        def row_to_series(row):
-            disaggregations = row[grouping_columns].to_dict()
-            series = sdg.Series(disaggregations, self.get_indicator_id(), logging=self.logging)
-            for year, value in zip(row['Year'], row['Value']):
-                series.add_value(year, value)
-            for attribute in observation_attributes:
-                if attribute in row and row[attribute]:
-                    for year, value in zip(row['Year'], row[attribute]):
-                        series.add_observation_attribute(year, attribute, value)
-
-            return series
-
-        # NaN must be replaced with '' so that it can be grouped by.
-        grouped = self.data.replace(np.nan, '', regex=True)
-        # Group by disaggreations to get each unique combination.
-        grouped = grouped.groupby(grouping_columns, as_index=False)[aggregating_columns].agg(lambda x: list(x))
-        # Convert to a list of Series objects.
-        grouped['series_objects'] = grouped.apply(row_to_series, axis=1)
-        self.serieses[language] = grouped['series_objects'].tolist()
+        # Sort each column into group order once, then slice out each series.
+        def sorted_column(column):
+            return data[column].to_numpy(dtype=object)[order].tolist()
+        years = sorted_column('Year')
+        values = sorted_column('Value')
+        attributes = {attribute: sorted_column(attribute) for attribute in observation_attributes}
+        ends = starts[1:] + [len(order)]
+
+        all_disaggregations = Indicator.get_series_disaggregations(data, grouping_columns, order, starts)
+        serieses = [
+            sdg.Series.from_arrays(disaggregations, years[start:end], values[start:end],
+                {attribute: attributes[attribute][start:end] for attribute in observation_attributes},
+                indicator_id=self.get_indicator_id(), logging=self.logging)
+            for disaggregations, start, end in zip(all_disaggregations, starts, ends)
+        ]
+
+        self.serieses[language] = serieses
         return self.serieses[language]
 
 
+    def get_series_groups(self):
+        """Group the rows of this indicator's data by their disaggregations.
+
+        Returns
+        -------
+        tuple
+            The data (with NaN replaced by ''), the grouping columns, the row
+            positions sorted by group, and the position in that sorted list
+            where each group starts. The groups are in the same order as
+            DataFrame.groupby would give.
+        """
+        # Assume "disaggregations" are everything except 'Year', 'Value', and
+        # any observation attributes.
+        aggregating_columns = ['Year', 'Value'] + self.options.get_observation_attributes()
+        grouping_columns = [column for column in self.data.columns if column not in aggregating_columns]
+        if len(grouping_columns) == 0:
+            return self.data, grouping_columns, None, None
+
+        # NaN must be replaced with '' so that it can be grouped by. Doing this
+        # on plain objects also keeps the groups in the same (sorted) order.
+        data = sdg.data.categorical_to_object(self.data).replace(np.nan, '', regex=True)
+        group_numbers = data.groupby(grouping_columns, sort=True).ngroup().to_numpy()
+        order = np.argsort(group_numbers, kind='stable')
+        starts = np.flatnonzero(np.diff(group_numbers[order])) + 1
+        return data, grouping_columns, order, [0] + starts.tolist()
+
+
+    def iter_series_disaggregations(self):
+        """Iterate over the disaggregations of each series in this indicator's data.
+
+        This is a cheaper alternative to get_all_series() for when only the
+        disaggregations are needed, because no Series objects are created.
+
+        Returns
+        -------
+        generator
+            Dicts describing the disaggregations, in the same order as
+            get_all_series().
+        """
+        if self.data.empty:
+            return iter([])
+        return Indicator.get_series_disaggregations(*self.get_series_groups())
+
+
+    @staticmethod
+    def get_series_disaggregations(data, grouping_columns, order, starts):
+        """Generate the disaggregations of each group from get_series_groups()."""
+        if len(grouping_columns) == 0:
+            yield {}
+            return
+        first_rows = order[starts]
+        keys = [data[column].to_numpy(dtype=object)[first_rows].tolist() for column in grouping_columns]
+        for key in zip(*keys):
+            yield dict(zip(grouping_columns, key))
+
+
     def get_data_matching_schema(self, data_schema, data=None, use_cache=True, language=None):
         if data is None:
             data = self.data
@@ -486,30 +836,41 @@ class Indicator(Loggable):
         if language is None:
             language = ''
         schema = data_schema.get_schema_for_indicator(self)
-        cache_key = language + str(schema.to_dict())
+        # Schemas are not changed during builds, so the identity of the schema
+        # object is enough to identify it. The schema is kept along with the
+        # results, so that its id cannot be reused by another object.
+        cache_key = (language, id(schema))
         if use_cache and cache_key in self.data_matching_schema:
-            return self.data_matching_schema[cache_key]
+            cached_schema, cached_df = self.data_matching_schema[cache_key]
+            if cached_schema is schema:
+                return cached_df
 
-        columns_in_data = data.columns.to_list()
         columns_in_schema = [field.name for field in schema.fields]
 
-        def row_matches_schema(row):
-            matches = True
-            for col in columns_in_data:
-                schema_field = schema.get_field(col) if col in columns_in_schema else None
-                there_is_data = not pd.isna(row[col])
-                if schema_field is None and there_is_data:
-                    matches = False
-                elif schema_field is not None and 'enum' in schema_field.constraints:
-                    allowed_values = schema_field.constraints['enum']
-                    if row[col] not in allowed_values and there_is_data:
-                        matches = False
-            return matches
-
-        mask = data.apply(row_matches_schema, axis=1)
+        # Columns not in the schema must be empty. For this indicator's own
+        # data, the null patterns are enough to check that.
+        columns_not_in_schema = [col for col in data.columns if col not in columns_in_schema]
+        if data is self.data:
+            mask = self.null_patterns.select(columns_not_in_schema).get_empty_rows()
+        else:
+            mask = data[columns_not_in_schema].isna().all(axis=1).to_numpy()
+
+        # Check each other column at once, and only keep rows where all columns pass.
+        for col in data.columns:
+            if col in columns_not_in_schema:
+                continue
+            schema_field = schema.get_field(col)
+            if 'enum' in schema_field.constraints:
+                # Check each distinct value against the allowed values once.
+                allowed_values = schema_field.constraints['enum']
+                codes, uniques = data[col].factorize()
+                allowed = np.array([value in allowed_values for value in uniques] + [True], dtype=bool)
+                # Empty values (code -1) are always allowed.
+                mask &= allowed[codes]
+
         df = data[mask]
 
-        self.data_matching_schema[cache_key] = df
+        self.data_matching_schema[cache_key] = (schema, df)
         return df
 
 
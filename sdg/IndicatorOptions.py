@@ -13,6 +13,7 @@ class IndicatorOptions:
         self.series_column = 'Series'
         self.unit_column = 'Units'
         self.observation_attributes = []
+        self.categorical_columns = False
 
 
     def add_non_disaggregation_columns(self, column):
@@ -51,3 +52,12 @@ class IndicatorOptions:
 
     def get_unit_column(self):
         return self.unit_column
+
+
+    def set_categorical_columns(self, categorical_columns):
+        self.categorical_columns = categorical_columns
+        return self
+
+
+    def get_categorical_columns(self):
+        return self.categorical_columns
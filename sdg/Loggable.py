@@ -1,7 +1,20 @@
 import time
+import functools
+from contextlib import nullcontext
+from sdg.logs.LogPrintSink import LogPrintSink
+from sdg.logs.LogSpan import LogSpan
 
 class Loggable:
-    """Allows subclasses to print debug statements."""
+    """Allows subclasses to print debug statements and time spans of code."""
+
+
+    # Allow subclasses to use __slots__ (the "logging" slot is up to them).
+    __slots__ = ()
+
+    # Where log messages and spans are sent (see Loggable.add_sink).
+    sinks = (LogPrintSink(),)
+    # The subset of sinks that want spans.
+    span_sinks = ()
 
 
     def __init__(self, logging=None):
@@ -24,14 +37,128 @@ class Loggable:
             message = message.format(**kwargs)
         except:
             pass
-        print(Loggable.get_timestamp() + ' - ' + message)
+        record = {
+            'type': 'message',
+            'time': time.time(),
+            'class_name': kwargs['class_name'],
+            'message': message,
+        }
+        for sink in Loggable.sinks:
+            sink.write_message(record)
+
+
+    def span(self, name, category=None, indicator=None, **details):
+        """Time a block of code, reporting it to any sinks that want spans.
+
+        When no sink wants spans, this does nothing.
+
+        Parameters
+        ----------
+        name : string
+            A descriptive name for the span, or for indicators, the task.
+        category : string or None
+            An optional category for grouping similar spans.
+        indicator : Indicator or None
+            If specified, the span is about this indicator.
+        details
+            Any other JSON-serializable information about the span.
+
+        Returns
+        -------
+        context manager
+        """
+        sinks = Loggable.span_sinks
+        if not sinks:
+            return nullcontext()
+        return LogSpan(sinks, name, category=category, class_name=type(self).__name__,
+            indicator=indicator, details=details)
+
+
+    def add_span(self, name, start, seconds, category=None, indicator=None, **details):
+        """Report a span of code that was already timed, such as in another process.
+
+        Parameters
+        ----------
+        name : string
+            A descriptive name for the span, or for indicators, the task.
+        start : float
+            The start time, in seconds since the epoch.
+        seconds : float
+            The duration in seconds.
+        category : string or None
+            An optional category for grouping similar spans.
+        indicator : Indicator or None
+            If specified, the span is about this indicator.
+        details
+            Any other JSON-serializable information about the span.
+        """
+        sinks = Loggable.span_sinks
+        if sinks:
+            LogSpan.emit(sinks, name, start, seconds, category=category,
+                class_name=type(self).__name__, indicator=indicator, details=details)
+
+
+    @staticmethod
+    def spanned(name=None, category=None):
+        """Decorate a method of a Loggable class so that each call is a span.
+
+        Parameters
+        ----------
+        name : string or None
+            A descriptive name for the span. Defaults to the method name.
+        category : string or None
+            An optional category for grouping similar spans.
+        """
+        def decorator(method):
+            span_name = method.__name__ if name is None else name
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with self.span(span_name, category=category):
+                    return method(self, *args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    @staticmethod
+    def add_sink(sink):
+        """Start sending log messages and spans to a sink.
+
+        Parameters
+        ----------
+        sink : LogSinkBase
+            The sink to add.
+        """
+        if sink not in Loggable.sinks:
+            Loggable.set_sinks(Loggable.sinks + (sink,))
+
+
+    @staticmethod
+    def remove_sink(sink):
+        """Stop sending log messages and spans to a sink.
+
+        Parameters
+        ----------
+        sink : LogSinkBase
+            The sink to remove.
+        """
+        Loggable.set_sinks(tuple(existing for existing in Loggable.sinks if existing is not sink))
+
+
+    @staticmethod
+    def set_sinks(sinks):
+        """Replace all of the sinks.
+
+        Parameters
+        ----------
+        sinks : tuple
+            The sinks to use, such as (LogPrintSink(),).
+        """
+        sinks = tuple(sinks)
+        # Assign these as a whole, so that other threads never see a partial update.
+        Loggable.span_sinks = tuple(sink for sink in sinks if sink.spans)
+        Loggable.sinks = sinks
 
 
     @staticmethod
     def get_timestamp():
-        start_time = getattr(Loggable.get_timestamp, 'start_time', None)
-        if start_time is None:
-            start_time = time.time()
-            Loggable.get_timestamp.start_time = start_time
-        elapsed = time.time() - start_time
-        return time.strftime("%H:%M:%S", time.gmtime(elapsed))
+        return LogPrintSink.get_timestamp()
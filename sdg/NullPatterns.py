@@ -0,0 +1,125 @@
+import numpy as np
+
+class NullPatterns:
+    """The distinct combinations of empty and non-empty cells in some data.
+
+    Things like the headline and the edges only depend on which cells are
+    empty, and even large datasets usually have only a few dozen distinct
+    patterns of empty cells. So each row is reduced to a bit-packed pattern,
+    and the rows are grouped by pattern.
+    """
+
+
+    def __init__(self, columns, patterns, row_patterns):
+        """Constructor for the NullPatterns class.
+
+        Usually this is created with NullPatterns.from_dataframe().
+
+        Parameters
+        ----------
+        columns : list
+            The column names.
+        patterns : numpy array
+            A 2-dimensional boolean array, with one row per distinct pattern
+            and one column per column name. True means "not empty".
+        row_patterns : numpy array
+            For each row of the data, the index of its pattern.
+        """
+        self.columns = list(columns)
+        self.patterns = patterns
+        self.row_patterns = row_patterns
+        self.counts = np.bincount(row_patterns, minlength=len(patterns))
+
+
+    @classmethod
+    def from_dataframe(cls, df, columns=None):
+        """Find the null patterns of a DataFrame.
+
+        Parameters
+        ----------
+        df : DataFrame
+            The data.
+        columns : list or None
+            The columns to consider. Defaults to all columns.
+
+        Returns
+        -------
+        NullPatterns
+        """
+        if columns is None:
+            columns = df.columns
+        present = df[list(columns)].notnull().to_numpy(dtype=bool)
+        return cls.from_present(columns, present)
+
+
+    @classmethod
+    def from_present(cls, columns, present):
+        """Find the null patterns of a boolean "not empty" array.
+
+        Parameters
+        ----------
+        columns : list
+            The column names.
+        present : numpy array
+            A 2-dimensional boolean array, with one row per row of data and
+            one column per column name. True means "not empty".
+
+        Returns
+        -------
+        NullPatterns
+        """
+        num_rows, num_columns = present.shape
+        if num_columns == 0 or num_rows == 0:
+            # Without columns, all rows have the same (empty) pattern.
+            patterns = np.zeros((min(num_rows, 1), num_columns), dtype=bool)
+            return cls(columns, patterns, np.zeros(num_rows, dtype=np.intp))
+        packed = np.packbits(present, axis=1)
+        unique, row_patterns = np.unique(packed, axis=0, return_inverse=True)
+        patterns = np.unpackbits(unique, axis=1, count=num_columns).astype(bool)
+        return cls(columns, patterns, row_patterns.reshape(-1))
+
+
+    def select(self, columns):
+        """Get the null patterns of only some of the columns.
+
+        Parameters
+        ----------
+        columns : list
+            The column names, which must all be in this object.
+
+        Returns
+        -------
+        NullPatterns
+        """
+        columns = list(columns)
+        indexes = [self.columns.index(column) for column in columns]
+        selected = NullPatterns.from_present(columns, self.patterns[:, indexes])
+        return NullPatterns(columns, selected.patterns, selected.row_patterns[self.row_patterns])
+
+
+    def rename(self, mapper):
+        """Get the same null patterns with different column names.
+
+        Parameters
+        ----------
+        mapper : dict
+            Old column names mapped to new column names.
+
+        Returns
+        -------
+        NullPatterns
+        """
+        columns = [mapper.get(column, column) for column in self.columns]
+        return NullPatterns(columns, self.patterns, self.row_patterns)
+
+
+    def get_empty_rows(self):
+        """Find the rows which are empty in all of the columns.
+
+        Returns
+        -------
+        numpy array
+            A boolean array with one value per row of the data.
+        """
+        empty_patterns = ~self.patterns.any(axis=1)
+        return empty_patterns[self.row_patterns]
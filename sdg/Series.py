@@ -25,6 +25,15 @@ class Series(Loggable):
         }
     """
 
+    # Many thousands of series can be created per build, so keep them compact.
+    # The years, values and observation attributes are stored as parallel
+    # lists (along with the position of each year), and the dicts described
+    # above are only created when requested, and then cached.
+    __slots__ = ('disaggregations', 'indicator_id', 'logging', 'years',
+                 'year_values', 'year_positions', 'attribute_years',
+                 'attribute_names', 'attribute_values', 'values_cache',
+                 'observation_attributes_cache')
+
     def __init__(self, disaggregations, indicator_id='Indicator', logging=None):
         """Constructor for the SDG series instances.
 
@@ -37,9 +46,80 @@ class Series(Loggable):
         """
         Loggable.__init__(self, logging=logging)
         self.disaggregations = disaggregations
-        self.values = {}
-        self.observation_attributes = {}
         self.indicator_id = indicator_id
+        self.years = []
+        self.year_values = []
+        self.year_positions = {}
+        self.attribute_years = []
+        self.attribute_names = []
+        self.attribute_values = []
+        self.values_cache = None
+        self.observation_attributes_cache = None
+
+    @classmethod
+    def from_arrays(cls, disaggregations, years, values, observation_attributes=None,
+                    indicator_id='Indicator', logging=None):
+        """Create a series from parallel lists of years and values.
+
+        This gives the same result as calling add_value() and then
+        add_observation_attribute() for each year, but faster.
+
+        Parameters
+        ----------
+        disaggregations : dict
+            A dict describing the disaggregations contained in the series.
+        years : list
+            The years of the values.
+        values : list
+            The values, in the same order as the years.
+        observation_attributes : dict or None
+            Lists of attribute values (in the same order as the years), keyed
+            by attribute name.
+        indicator_id : string
+            Optional indicator ID this series is a part of (eg, 1.1.1).
+
+        Returns
+        -------
+        Series
+            The new series.
+        """
+        series = cls(disaggregations, indicator_id=indicator_id, logging=logging)
+        years = list(years)
+        values = list(values)
+        year_positions = {year: position for position, year in enumerate(years)}
+        if len(year_positions) == len(years):
+            series.years = years
+            series.year_values = values
+            series.year_positions = year_positions
+        else:
+            # Let add_value() deal with the duplicates.
+            for year, value in zip(years, values):
+                series.add_value(year, value)
+        if observation_attributes:
+            for attribute in observation_attributes:
+                series.attribute_years.extend(years)
+                series.attribute_names.extend([attribute] * len(years))
+                series.attribute_values.extend(observation_attributes[attribute])
+        return series
+
+    @property
+    def values(self):
+        """A dict of year/value pairs describing the data per year."""
+        if self.values_cache is None:
+            self.values_cache = dict(zip(self.years, self.year_values))
+        return self.values_cache
+
+    @property
+    def observation_attributes(self):
+        """A dict of year/attribute pairs describing the attributes per year."""
+        if self.observation_attributes_cache is None:
+            observation_attributes = {}
+            for year, attribute, value in zip(self.attribute_years, self.attribute_names, self.attribute_values):
+                if year not in observation_attributes:
+                    observation_attributes[year] = {}
+                observation_attributes[year][attribute] = value
+            self.observation_attributes_cache = observation_attributes
+        return self.observation_attributes_cache
 
     def get_disaggregations(self):
         """Get the disaggregations for this series.
@@ -81,12 +161,15 @@ class Series(Loggable):
         value : numeric
             The numerical value to add.
         """
-        if year in self.values:
+        if year in self.year_positions:
             self.warn('{inid} - Duplicate values for year {year}: {value1} and {value2} in series: {series}',
                        inid=self.indicator_id, year=year, value1=value,
-                       value2=self.values[year], series=self.get_disaggregations())
+                       value2=self.year_values[self.year_positions[year]], series=self.get_disaggregations())
         else:
-            self.values[year] = value
+            self.year_positions[year] = len(self.years)
+            self.years.append(year)
+            self.year_values.append(value)
+            self.values_cache = None
 
     def add_observation_attribute(self, year, attribute, value):
         """Add a new yearly observation attriute.
@@ -100,9 +183,10 @@ class Series(Loggable):
         value : string
             The value of the attribute.
         """
-        if year not in self.observation_attributes:
-            self.observation_attributes[year] = {}
-        self.observation_attributes[year][attribute] = value
+        self.attribute_years.append(year)
+        self.attribute_names.append(attribute)
+        self.attribute_values.append(value)
+        self.observation_attributes_cache = None
 
     def has_disaggregation(self, disaggregation):
         """Check to see if the series has a specific disaggregation.
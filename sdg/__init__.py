@@ -17,6 +17,11 @@ from . import schemas
 from . import data_schemas
 from . import translations
 from . import helpers
+from . import logs
+from .BuildManifest import BuildManifest
+from .BuildProfiler import BuildProfiler
+from .BuildScheduler import BuildScheduler
+from .DataPool import DataPool
 from .DisaggregationReportService import DisaggregationReportService
 from .DisaggregationStatusService import DisaggregationStatusService
 from .OutputDocumentationService import OutputDocumentationService
@@ -25,7 +30,9 @@ from .IndicatorDownloadService import IndicatorDownloadService
 from .IndicatorExportService import IndicatorExportService
 from .IndicatorOptions import IndicatorOptions
 from .MetadataReportService import MetadataReportService
+from .NullPatterns import NullPatterns
 from .Series import Series
 from .open_sdg import open_sdg_build
 from .open_sdg import open_sdg_check
+from .open_sdg import open_sdg_check_and_build
 
@@ -24,6 +24,9 @@ def is_numeric(col):
 def is_string(col):
     """Guess whether a column is a string"""
     dt = col.dtype
+    # Categorical columns are strings if their categories are.
+    if isinstance(dt, pd.CategoricalDtype):
+        dt = dt.categories.dtype
     return dt == np.dtype('str') or dt == np.dtype('O')
 
 # %% Checking a single item
@@ -127,10 +130,17 @@ def check_leading_whitespace(df, csv):
 # %% Check for empty rows
 
 
-def check_empty_rows(df, csv):
-    """Check for rows that are completely empty"""
+def check_empty_rows(df, csv, null_patterns=None):
+    """Check for rows that are completely empty
+
+    If the NullPatterns of the data frame are given, they are used instead of
+    checking every cell.
+    """
     status = True
-    empty_rows = df.isnull().all(axis=1)
+    if null_patterns is None:
+        empty_rows = df.isnull().all(axis=1)
+    else:
+        empty_rows = null_patterns.select(df.columns).get_empty_rows()
     if empty_rows.any():
         status = False
         print(csv, ': Empty row on rows: ', np.where(empty_rows)[0])
@@ -15,23 +15,41 @@ def get_inid_data(inid, src_dir=''):
     return df
 
 
-def filter_headline(df, non_disaggregation_columns):
+def filter_headline(df, non_disaggregation_columns, null_patterns=None):
     """Given a dataframe filter it down to just the headline data.
 
     In the case of multiple units it will keep all headline for each unit.
+
+    If the NullPatterns of the dataframe are given, they are used instead of
+    checking every cell.
     """
 
     special_cols = [col for col in non_disaggregation_columns if col in df.columns]
 
     # Select the non-data rows and filter rows that are all missing (nan)
-    disag = df.drop(special_cols, axis=1)
-    headline_rows = disag.isnull().all(axis=1)
+    if null_patterns is None:
+        disag = df.drop(special_cols, axis=1)
+        headline_rows = disag.isnull().all(axis=1)
+    else:
+        disag_cols = [col for col in df.columns if col not in special_cols]
+        headline_rows = null_patterns.select(disag_cols).get_empty_rows()
 
     headline = df.filter(special_cols, axis=1)[headline_rows]
 
     return headline
 
 
+def categorical_to_object(df):
+    """Convert any Categorical columns in a dataframe back to object columns.
+
+    Returns the same dataframe if there are no Categorical columns.
+    """
+    columns = {col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)}
+    if not columns:
+        return df
+    return df.astype(columns)
+
+
 def write_csv(inid, df, ftype='data', site_dir=''):
     """
     For a given ID and data set, write out as csv
@@ -20,7 +20,6 @@ This is one of the more complicated scripts in the suite. It does he following\
 
 import pandas as pd
 import numpy as np
-import itertools
 
 
 # %% Check correct columns - copied from csvcheck
@@ -53,50 +52,51 @@ def x_without_y(x, y):
     return np.any(y.isnull() & x.notnull())
 
 
-def detect_all_edges(inid, df, non_disaggregation_columns):
-    """Loop over the data frame and try all pairs"""
+def detect_all_edges(inid, df, non_disaggregation_columns, null_patterns=None):
+    """Try all pairs of columns at once, using a matrix of non-empty cells
+
+    If the NullPatterns of the data frame are given, only the distinct
+    patterns of non-empty cells are used, rather than every row.
+    """
     cols = df.columns
     # Remove the protected columns
     cols = cols[[x not in non_disaggregation_columns for x in cols]]
 
-    edges = pd.DataFrame(columns=['From', 'To'])
-
-    # Loop over all pairs
-    for a, b in itertools.combinations(cols, 2):
-        # itertools.combinations returns pairs of columns in the order
-        # they appear without repeating elements, so:
-        # combinations('ABCD', 2)	produces AB AC AD BC BD CD
-        # but does not produce BA, CA, etc.
-
-        # Check if a and b are ever present without each other
-        a_without_b = x_without_y(df[a], df[b])
-        b_without_a = x_without_y(df[b], df[a])
-
-        # Check if a and b are not empty.
-        a_not_empty = not df[a].dropna().empty
-        b_not_empty = not df[b].dropna().empty
-
-        # test if ab is an edge (at least one case where b has an empty
-        # elements where a does not)
-        if a_without_b and not b_without_a and b_not_empty:
-            # A is a parent of B
-            # so add to df of edges
-            edges = pd.concat([edges, pd.DataFrame({'From': [a], 'To': [b]})])
-
-        # if ab is not an edge, test whether ba is an edge
-        # (at least one case where a has empty and b doesn't)
-        elif b_without_a and not a_without_b and a_not_empty:
-            # B is a parent of A
-            # so add to df of edges
-            edges = pd.concat([edges, pd.DataFrame({'From': [b], 'To': [a]})])
-
-        # if ab not an edge and ba not an edge, then test that for every
-        # element in a there is an element in b and vice versa
-        elif not a_without_b and not b_without_a and a_not_empty and b_not_empty:
-            # co-depedent; choose A as left-most
-            edges = pd.concat([edges, pd.DataFrame({'From': [a], 'To': [b]})])
-
-    return edges
+    # present[row, i] is True if column i is not empty in that row.
+    if null_patterns is None:
+        present = df[cols].notnull().to_numpy(dtype=bool)
+    else:
+        present = null_patterns.select(cols).patterns
+    # without[i, j] is True if column i is ever present without column j
+    # (see x_without_y). Counting with a float matrix product is much faster
+    # than a boolean one, and the counts are never negative.
+    without = present.T.astype(np.float32) @ (~present).astype(np.float32) > 0
+    not_empty = present.any(axis=0)
+
+    # All pairs in the same order as itertools.combinations(cols, 2), so:
+    # AB AC AD BC BD CD but not BA, CA, etc.
+    a, b = np.triu_indices(len(cols), k=1)
+    a_without_b = without[a, b]
+    b_without_a = without[b, a]
+    a_not_empty = not_empty[a]
+    b_not_empty = not_empty[b]
+
+    # A is a parent of B if there is at least one case where B is empty and A
+    # is not, or if they are co-dependent (in which case A is the left-most).
+    a_parent = a_without_b & ~b_without_a & b_not_empty
+    co_dependent = ~a_without_b & ~b_without_a & a_not_empty & b_not_empty
+    # B is a parent of A if there is at least one case where A is empty and B
+    # is not.
+    b_parent = b_without_a & ~a_without_b & a_not_empty
+
+    is_edge = a_parent | b_parent | co_dependent
+    from_index = np.where(b_parent, b, a)[is_edge]
+    to_index = np.where(b_parent, a, b)[is_edge]
+
+    return pd.DataFrame({
+        'From': np.asarray(cols, dtype=object)[from_index],
+        'To': np.asarray(cols, dtype=object)[to_index],
+    }, columns=['From', 'To'])
 
 
 # %% Remove Grand Parents
@@ -107,7 +107,8 @@ def prune_grand_parents(edges):
 
     if A is a parent of B and B is a parent of C, then the detect_all_edges
     will return from A to C as an edge (see 'transitive relation')
-    this function removes the AC edge in those cases
+    this function removes the AC edge in those cases (a 'transitive
+    reduction'), using an adjacency matrix of the columns.
 
     Args:
         edges (DataFrame): The edges data frame
@@ -115,43 +116,31 @@ def prune_grand_parents(edges):
     Returns:
         The data frame with grand parent edges removed
     """
+    if edges.empty:
+        return edges
 
-    # iterate over unique 'children' (those that have parents)
-    for group in edges['To'].unique():
+    # Number the columns, and mark each edge in an adjacency matrix.
+    codes, columns = pd.factorize(pd.concat([edges['From'], edges['To']]))
+    parents = codes[:len(edges)]
+    children = codes[len(edges):]
+    is_parent = np.zeros((len(columns), len(columns)), dtype=bool)
+    is_parent[parents, children] = True
 
-        # list all the parents of the given child
-        parents0 = list(edges['From'][edges['To'] == group])
+    # Find all of the descendants of each column (Warshall's algorithm).
+    is_ancestor = is_parent.copy()
+    for column in range(len(columns)):
+        is_ancestor |= is_ancestor[:, [column]] & is_ancestor[column]
 
-        # create an empty list to fill with grandparents
-        grand_parents = list()
+    # A is a grand parent of C if C descends from any of the children of A.
+    is_grand_parent = (is_parent.astype(np.float32) @ is_ancestor.astype(np.float32)) > 0
 
-        # elements will be removed from parents0 inside the while loop - once
-        # they have all been removed, end loop
-        while len(parents0) > 0:
-            # go through the list of parents
-            for p in parents0:
-
-                # define parents as the list of parents of p (a known parent)
-                parents = list(edges['From'][edges['To'] == p])
-                # if len(parents) > 0, then there are parents of the parent (p)
-                if len(parents) > 0:
-                    # so add them to the list of grand_parents
-                    grand_parents = grand_parents + parents
-                # set parents0 to be the newly identified grand parents
-                parents0 = parents
-
-        # drop all edges where the 'from' is in grandparents AND where the 'to'
-        # is the child from the start of the outer for loop
-        keep = ~(edges['From'].isin(grand_parents) & (edges['To'] == group))
-
-        edges = edges[keep]
-    return edges
+    return edges[~is_grand_parent[parents, children]]
 
 
 # %% Write out edges for one inid
 
 
-def edge_detection(inid, df, non_disaggregation_columns):
+def edge_detection(inid, df, non_disaggregation_columns, null_patterns=None):
     """Check dependencies between columns and write out the edges
 
     If there are any problems return False as this is part of the build.
@@ -160,6 +149,7 @@ def edge_detection(inid, df, non_disaggregation_columns):
         inid (str): The indicator id for printing
         df (pandas DataFrame): The indicator data read from raw csv
         non_disaggregation_columns: List of columns that are not disaggregations
+        null_patterns (NullPatterns): Optional null patterns of the data frame
 
     Returns:
         DataFrame: edge data frame
@@ -168,7 +158,7 @@ def edge_detection(inid, df, non_disaggregation_columns):
     check_headers(inid, df)
 
     # Get the edges
-    edges = detect_all_edges(inid, df, non_disaggregation_columns)
+    edges = detect_all_edges(inid, df, non_disaggregation_columns, null_patterns)
     edges = prune_grand_parents(edges)
 
     return edges
@@ -1,3 +1,5 @@
+import os
+import hashlib
 from urllib.request import urlopen
 import pandas as pd
 import numpy as np
@@ -48,13 +50,98 @@ class InputBase(Loggable):
             if indicator_options == self.last_executed_indicator_options:
                 return
         self.last_executed_indicator_options = indicator_options
-        self.execute(indicator_options)
+        with self.span('Input: ' + type(self).__name__, category='input'):
+            self.execute(indicator_options)
 
 
     def execute(self, indicator_options):
         self.debug('Starting input: {class_name}')
 
 
+    def get_cache_key(self):
+        """Describe the source of this input, for caching merged indicators.
+
+        Subclasses which can cheaply detect changes to their source (such as
+        local files) should override this. The default of None means that the
+        results of this input can never be cached.
+
+        Returns
+        -------
+        JSON-serializable value or None
+            A value which changes whenever the results of the input would
+            change, or None if this cannot be determined.
+        """
+        return None
+
+
+    def get_alterations_cache_key(self):
+        """Describe the alterations and mappings of this input, for caching.
+
+        The alteration functions are identified by their module, name and
+        compiled code. Note that any values captured from outside the function
+        (such as closure variables) are not taken into account.
+
+        Returns
+        -------
+        dict
+            A JSON-serializable description.
+        """
+        return {
+            'data_alterations': [self.get_callable_cache_key(alteration) for alteration in self.data_alterations],
+            'meta_alterations': [self.get_callable_cache_key(alteration) for alteration in self.meta_alterations],
+            'column_map': self.get_file_cache_key(self.column_map),
+            'code_map': self.get_file_cache_key(self.code_map),
+            'meta_suffix': self.meta_suffix,
+        }
+
+
+    @staticmethod
+    def get_callable_cache_key(function):
+        """Identify a function in a way that is stable between processes.
+
+        Parameters
+        ----------
+        function : function
+
+        Returns
+        -------
+        list
+            The module, the qualified name, and a hash of the compiled code.
+        """
+        code = getattr(function, '__code__', None)
+        code_hash = None
+        if code is not None:
+            hasher = hashlib.sha256(code.co_code)
+            hasher.update(repr(code.co_consts).encode('utf-8'))
+            code_hash = hasher.hexdigest()
+        return [
+            getattr(function, '__module__', None),
+            getattr(function, '__qualname__', repr(function)),
+            code_hash,
+        ]
+
+
+    @staticmethod
+    def get_file_cache_key(location):
+        """Identify a local file by its path, modification time and size.
+
+        Parameters
+        ----------
+        location : string or None
+            A path or a remote URL.
+
+        Returns
+        -------
+        list or string or None
+            The path, modification time and size for local files, otherwise
+            the location unchanged.
+        """
+        if isinstance(location, str) and os.path.isfile(location):
+            stat = os.stat(location)
+            return [location, stat.st_mtime_ns, stat.st_size]
+        return location
+
+
     def get_row(self, year, value, disaggregations):
         """Return a dict for placing a row in a dataframe.
 
@@ -188,7 +275,8 @@ class InputBase(Loggable):
         return df
 
 
-    def add_indicator(self, indicator_id, name=None, data=None, meta=None, options=None):
+    def add_indicator(self, indicator_id, name=None, data=None, meta=None, options=None,
+                      data_loader=None, data_pool=None):
         """Add an indicator to this input.
 
         Parameters
@@ -203,10 +291,16 @@ class InputBase(Loggable):
             The indicator metadata
         options : IndicatorOptions or None
             The indicator options
+        data_loader : function or None
+            Optional function to load the data lazily, instead of passing data.
+            The loader is responsible for any data alterations.
+        data_pool : DataPool or None
+            The pool for lazily-loaded data, if using data_loader.
         """
         data = self.alter_data(data, indicator_id=indicator_id)
         meta = self.alter_meta(meta, indicator_id=indicator_id)
-        indicator = Indicator(indicator_id, name=name, data=data, meta=meta, options=options, logging=self.logging)
+        indicator = Indicator(indicator_id, name=name, data=data, meta=meta, options=options, logging=self.logging,
+                              data_loader=data_loader, data_pool=data_pool)
         self.indicators[indicator_id] = indicator
 
 
@@ -1,5 +1,7 @@
+import functools
 import pandas as pd
 import sdg
+from sdg.DataPool import DataPool
 from sdg.inputs import InputFiles
 from sdg.Indicator import Indicator
 
@@ -8,16 +10,22 @@ class InputCsvData(InputFiles):
 
     def __init__(self, path_pattern='', logging=None,
                  column_map=None, code_map=None,
-                 dtype=None):
+                 dtype=None, lazy=False, max_resident=100):
         """Constructor for InputCsvData.
 
         Keyword arguments:
         dtype: dict showing the datatypes of certain columns.
+        lazy: whether to read each CSV file only when its data is needed,
+          rather than reading them all up front.
+        max_resident: when lazy, the maximum number of DataFrames (including
+          headlines and edges) to keep in memory at once.
         """
         InputFiles.__init__(self, path_pattern=path_pattern,
                             logging=logging, column_map=column_map,
                             code_map=code_map)
         self.dtype = {} if dtype is None else dtype
+        self.lazy = lazy
+        self.data_pool = DataPool(max_size=max_resident, logging=logging) if lazy else None
 
     def convert_filename_to_indicator_id(self, filename):
         """Assume the file naming convention: 'indicator_1-1-1'."""
@@ -29,5 +37,25 @@ class InputCsvData(InputFiles):
         """Get the data, edges, and headline from CSV, returning a list of indicators."""
         indicator_map = self.get_indicator_map()
         for inid in indicator_map:
-            data = pd.read_csv(indicator_map[inid], dtype=self.dtype)
-            self.add_indicator(inid, data=data, options=indicator_options)
+            if self.lazy:
+                data_loader = functools.partial(self.read_data, inid, indicator_map[inid])
+                self.add_indicator(inid, options=indicator_options,
+                    data_loader=data_loader, data_pool=self.data_pool)
+            else:
+                data = pd.read_csv(indicator_map[inid], dtype=self.dtype)
+                self.add_indicator(inid, data=data, options=indicator_options)
+
+    def read_data(self, indicator_id, path):
+        """Read and alter the data for one indicator, for lazy loading."""
+        data = pd.read_csv(path, dtype=self.dtype)
+        return self.alter_data(data, indicator_id=indicator_id)
+
+    def get_cache_key(self):
+        """Lazily-loaded data is not cached. Overrides parent."""
+        if self.lazy:
+            return None
+        return InputFiles.get_cache_key(self)
+
+    def get_cache_settings(self):
+        """Include the datatypes in the cache key. Overrides parent."""
+        return {'dtype': {column: str(self.dtype[column]) for column in self.dtype}}
@@ -21,6 +21,13 @@ class InputExcelMeta(InputMetaFiles):
         self.sheet_number = sheet_number
 
 
+    def get_cache_settings(self):
+        """Include the sheet number in the cache key. Overrides parent."""
+        settings = InputMetaFiles.get_cache_settings(self)
+        settings['sheet_number'] = self.sheet_number
+        return settings
+
+
     def read_meta_at_path(self, filepath):
         meta_excel = pd.ExcelFile(filepath)
         meta_df = meta_excel.parse(meta_excel.sheet_names[self.sheet_number], header=None, index_col=0).squeeze('columns')
@@ -39,3 +39,17 @@ class InputFiles(InputBase):
             inid = self.convert_path_to_indicator_id(path)
             indicator_map[inid] = path
         return indicator_map
+
+    def get_cache_key(self):
+        """Describe the files of this input, for caching. Overrides parent."""
+        return {
+            'class': type(self).__name__,
+            'path_pattern': self.path_pattern,
+            'files': [self.get_file_cache_key(path) for path in sorted(self.get_file_paths())],
+            'settings': self.get_cache_settings(),
+            'alterations': self.get_alterations_cache_key(),
+        }
+
+    def get_cache_settings(self):
+        """Allow subclasses to add any settings that affect the results."""
+        return {}
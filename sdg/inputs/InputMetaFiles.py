@@ -44,6 +44,31 @@ class InputMetaFiles(InputFiles):
             self.add_indicator(inid, name=name, meta=meta, options=indicator_options)
 
 
+    def get_cache_settings(self):
+        """Include translated files and git dates in the cache key. Overrides parent."""
+        translated_files = []
+        for filepath in sorted(self.get_file_paths()):
+            meta_folder = os.path.dirname(filepath)
+            filename = os.path.basename(filepath)
+            for language in sorted(next(os.walk(meta_folder))[1]):
+                translated_filepath = os.path.join(meta_folder, language, filename)
+                if os.path.isfile(translated_filepath):
+                    translated_files.append(self.get_file_cache_key(translated_filepath))
+        settings = {
+            'translated_files': translated_files,
+            'metadata_mapping': self.get_file_cache_key(self.metadata_mapping),
+            'git': self.git,
+        }
+        if self.git:
+            # The dates come from the git history, so use the latest commit.
+            folder = os.path.dirname(self.path_pattern)
+            repo = git.Repo(folder if folder else '.', search_parent_directories=True)
+            settings['git_commit'] = repo.head.commit.hexsha
+            settings['git_data_dir'] = self.git_data_dir
+            settings['git_data_filemask'] = self.git_data_filemask
+        return settings
+
+
     def read_meta(self, filepath):
         meta = self.read_meta_at_path(filepath)
         self.add_language_folders(meta, filepath)
@@ -35,6 +35,11 @@ class InputSdmxMl_Multiple(InputFiles):
         self.kwargs = kwargs
 
 
+    def get_cache_key(self):
+        """The SDMX inputs may use remote DSDs, so never cache. Overrides parent."""
+        return None
+
+
     def execute(self, indicator_options):
         """Scan the SDMX files and create indicators."""
         indicator_map = self.get_indicator_map()
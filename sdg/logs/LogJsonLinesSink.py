@@ -0,0 +1,55 @@
+import os
+import json
+import threading
+from sdg.logs.LogSinkBase import LogSinkBase
+
+class LogJsonLinesSink(LogSinkBase):
+    """Write log messages and spans to a file, one JSON object per line."""
+
+
+    spans = True
+
+
+    def __init__(self, path, messages=True):
+        """Constructor for the LogJsonLinesSink class.
+
+        Parameters
+        ----------
+        path : string
+            The path to the JSON-lines file. Any existing file is replaced.
+        messages : boolean
+            Whether to write log messages in addition to spans.
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.messages = messages
+        self.lock = threading.Lock()
+        self.file = open(path, 'w', encoding='utf-8')
+
+
+    def write_message(self, record):
+        if self.messages:
+            self.write_line(record)
+
+
+    def write_span(self, record, indicator=None):
+        if indicator is not None:
+            record = dict(record)
+            record['indicator_id'] = indicator.inid
+        self.write_line(record)
+
+
+    def write_line(self, record):
+        line = json.dumps(record, default=str) + '\n'
+        with self.lock:
+            if self.file is not None:
+                self.file.write(line)
+
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
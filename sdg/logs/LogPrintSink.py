@@ -0,0 +1,39 @@
+import time
+from sdg.logs.LogSinkBase import LogSinkBase
+
+class LogPrintSink(LogSinkBase):
+    """Print log messages (and optionally spans) with an elapsed timestamp."""
+
+
+    def __init__(self, spans=False):
+        """Constructor for the LogPrintSink class.
+
+        Parameters
+        ----------
+        spans : boolean
+            Whether to also print the duration of each span.
+        """
+        self.spans = spans
+
+
+    def write_message(self, record):
+        print(LogPrintSink.get_timestamp() + ' - ' + record['message'])
+
+
+    def write_span(self, record, indicator=None):
+        name = record['name']
+        if indicator is not None:
+            name += ' [' + indicator.inid + ']'
+        print(LogPrintSink.get_timestamp() + ' - ' + '  ' * record['depth'] +
+              name + ': ' + '{:.3f}'.format(record['duration_ms']) + ' ms')
+
+
+    @staticmethod
+    def get_timestamp():
+        """Get the time elapsed since the first call, as HH:MM:SS."""
+        start_time = getattr(LogPrintSink.get_timestamp, 'start_time', None)
+        if start_time is None:
+            start_time = time.time()
+            LogPrintSink.get_timestamp.start_time = start_time
+        elapsed = time.time() - start_time
+        return time.strftime("%H:%M:%S", time.gmtime(elapsed))
@@ -0,0 +1,42 @@
+class LogSinkBase:
+    """Base class for destinations of log messages and timed spans.
+
+    Sinks are added with Loggable.add_sink(). Sinks only receive spans if
+    their "spans" attribute is True, so that timing costs nothing when no sink
+    is interested.
+    """
+
+
+    # Whether this sink wants to receive timed spans.
+    spans = False
+
+
+    def write_message(self, record):
+        """Receive a log message.
+
+        Parameters
+        ----------
+        record : dict
+            The message record, including "time", "class_name" and "message".
+        """
+        pass
+
+
+    def write_span(self, record, indicator=None):
+        """Receive a finished span.
+
+        Parameters
+        ----------
+        record : dict
+            The span record, including "name", "category", "start", "end",
+            "duration_ms", "id", "parent", "depth" and "thread", along with
+            any other details that were specified for the span.
+        indicator : Indicator or None
+            The indicator that the span was about, if any.
+        """
+        pass
+
+
+    def close(self):
+        """Release any resources held by the sink."""
+        pass
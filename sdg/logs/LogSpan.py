@@ -0,0 +1,114 @@
+import time
+import itertools
+import threading
+
+# Per-thread stack of open span ids, for tracking nesting.
+_open_spans = threading.local()
+
+class LogSpan:
+    """A timed section of code, reported to sinks when it finishes.
+
+    Spans are normally created with Loggable.span(). Spans opened inside
+    another span on the same thread are nested beneath it.
+    """
+
+
+    ids = itertools.count(1)
+
+
+    def __init__(self, sinks, name, category=None, class_name=None,
+                 indicator=None, details=None):
+        """Constructor for the LogSpan class.
+
+        Parameters
+        ----------
+        sinks : list
+            The LogSinkBase objects to report to.
+        name : string
+            A descriptive name for the span.
+        category : string or None
+            An optional category for grouping similar spans.
+        class_name : string or None
+            The name of the class that opened the span.
+        indicator : Indicator or None
+            The indicator that the span is about, if any.
+        details : dict or None
+            Any other JSON-serializable information about the span.
+        """
+        self.sinks = sinks
+        self.name = name
+        self.category = category
+        self.class_name = class_name
+        self.indicator = indicator
+        self.details = details
+        self.id = None
+        self.parent = None
+        self.depth = 0
+        self.start = None
+        self.start_counter = None
+
+
+    def __enter__(self):
+        stack = getattr(_open_spans, 'stack', None)
+        if stack is None:
+            stack = _open_spans.stack = []
+        self.id = next(LogSpan.ids)
+        self.parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        stack.append(self.id)
+        self.start = time.time()
+        self.start_counter = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start_counter
+        stack = _open_spans.stack
+        if stack and stack[-1] == self.id:
+            stack.pop()
+        LogSpan.emit(self.sinks, self.name, self.start, duration,
+            category=self.category, class_name=self.class_name,
+            indicator=self.indicator, details=self.details, span_id=self.id,
+            parent=self.parent, depth=self.depth, error=exc_type is not None)
+        return False
+
+
+    @staticmethod
+    def emit(sinks, name, start, duration, category=None, class_name=None,
+             indicator=None, details=None, span_id=None, parent=None, depth=0,
+             error=False):
+        """Report a finished span to sinks.
+
+        This can also be used for work that was timed elsewhere, such as in
+        another process.
+
+        Parameters
+        ----------
+        sinks : list
+            The LogSinkBase objects to report to.
+        name : string
+            A descriptive name for the span.
+        start : float
+            The start time, in seconds since the epoch.
+        duration : float
+            The duration in seconds.
+        """
+        record = {
+            'type': 'span',
+            'name': name,
+            'category': category,
+            'class_name': class_name,
+            'start': start,
+            'end': start + duration,
+            'duration_ms': duration * 1000,
+            'id': next(LogSpan.ids) if span_id is None else span_id,
+            'parent': parent,
+            'depth': depth,
+            'thread': threading.current_thread().name,
+        }
+        if error:
+            record['error'] = True
+        if details:
+            record.update(details)
+        for sink in sinks:
+            sink.write_span(record, indicator=indicator)
@@ -0,0 +1,4 @@
+from .LogSinkBase import LogSinkBase
+from .LogPrintSink import LogPrintSink
+from .LogJsonLinesSink import LogJsonLinesSink
+from .LogSpan import LogSpan
@@ -46,7 +46,10 @@ def open_sdg_build(src_dir='', site_dir='_site', schema_file='_prose.yml',
                    logging=None, indicator_export_filename='all_indicators',
                    datapackage=None, csvw=None, data_schema=None, docs_metadata_fields=None,
                    alter_indicator=None, indicator_callback=None,
-                   ignore_out_of_scope_disaggregation_stats=False):
+                   ignore_out_of_scope_disaggregation_stats=False, workers=1,
+                   worker_type='thread', language_workers=1, output_workers=1,
+                   stream_languages=False, incremental=False, cache_dir=None, validate=False,
+                   profile_path=None, profile_top_indicators=10, log_path=None):
     """Read each input file and edge file and write out json.
 
     Args:
@@ -90,6 +93,31 @@ def open_sdg_build(src_dir='', site_dir='_site', schema_file='_prose.yml',
             the MetadataReportService class.
         ignore_out_of_scope_disaggregation_stats: boolean. Whether to omit the
             not-applicable disaggregation stats.
+        workers: int. The number of indicators to write in parallel in the
+            Open SDG output.
+        worker_type: string. Either 'thread' or 'process', the kind of pool
+            to use when workers is greater than 1.
+        language_workers: int. The number of languages to build at the same
+            time for each output.
+        output_workers: int. The number of outputs to build at the same time.
+            The documentation is always generated after all outputs finish.
+        stream_languages: boolean. Whether to build one language at a time
+            across all of the outputs, forgetting each language's translated
+            indicators before moving on to the next. This keeps the memory use
+            to roughly one language's worth, and ignores language_workers.
+        incremental: boolean. Whether the Open SDG output should skip writing
+            any indicators that are unchanged since the previous build into
+            the same site_dir.
+        cache_dir: string. Optional folder in which to cache the merged
+            indicators, so that later checks/builds can skip reading inputs.
+        validate: boolean. Whether to validate the indicators first, and abort
+            before writing anything if the validation fails.
+        profile_path: string. Optional path to a JSON file in which to write
+            the timings and peak memory of each stage of the build.
+        profile_top_indicators: int. The number of slowest indicators to list
+            in the profile.
+        log_path: string. Optional path to a JSON-lines file in which to write
+            the log messages and the timed (and nested) spans of the build.
 
     Returns:
         Boolean status of file writes
@@ -107,8 +135,6 @@ def open_sdg_build(src_dir='', site_dir='_site', schema_file='_prose.yml',
     if docs_metadata_fields is None:
         docs_metadata_fields = []
 
-    status = True
-
     # Build a dict of options for open_sdg_prep().
     defaults = {
         'src_dir': src_dir,
@@ -136,6 +162,17 @@ def open_sdg_build(src_dir='', site_dir='_site', schema_file='_prose.yml',
         'indicator_export_filename': indicator_export_filename,
         'docs_metadata_fields': docs_metadata_fields,
         'ignore_out_of_scope_disaggregation_stats': ignore_out_of_scope_disaggregation_stats,
+        'workers': workers,
+        'worker_type': worker_type,
+        'language_workers': language_workers,
+        'output_workers': output_workers,
+        'stream_languages': stream_languages,
+        'incremental': incremental,
+        'cache_dir': cache_dir,
+        'validate': validate,
+        'profile_path': profile_path,
+        'profile_top_indicators': profile_top_indicators,
+        'log_path': log_path,
     }
     # Allow for a config file to update these.
     options = open_sdg_config(config, defaults)
@@ -157,44 +194,186 @@ def open_sdg_build(src_dir='', site_dir='_site', schema_file='_prose.yml',
     # Convert the indicator options.
     options['indicator_options'] = open_sdg_indicator_options_from_dict(options['indicator_options'])
 
+    # Optionally profile the build.
+    profiler = None
+    if options['profile_path'] is not None:
+        profiler = sdg.BuildProfiler(top_indicators=options['profile_top_indicators'], logging=options['logging'])
+        profiler.activate()
+    # Optionally log the build to a file.
+    log_sink = None
+    if options['log_path'] is not None:
+        log_sink = sdg.logs.LogJsonLinesSink(options['log_path'])
+        sdg.Loggable.add_sink(log_sink)
+    try:
+        return open_sdg_build_from_options(options)
+    finally:
+        if log_sink is not None:
+            sdg.Loggable.remove_sink(log_sink)
+            log_sink.close()
+        if profiler is not None:
+            profiler.deactivate()
+            profiler.write(options['profile_path'])
+
+
+def open_sdg_build_from_options(options):
+    """Prepare and build all outputs from an already-processed dict of options.
+
+    Args:
+        options: Dict of options, as prepared in open_sdg_build().
+
+    Returns:
+        Boolean status of file writes
+    """
+    status = True
+
     # Prepare the outputs.
     outputs = open_sdg_prep(options)
 
-    for output in outputs:
-        if options['languages']:
-            status = status & output.execute_per_language(options['languages'])
-            status = status & output.execute('untranslated')
-        else:
-            sys.exit('The data configuration must have a "languages" setting with at least one language. See the documentation here: https://open-sdg.readthedocs.io/en/latest/data-configuration/#languages')
+    if not options['languages']:
+        sys.exit('The data configuration must have a "languages" setting with at least one language. See the documentation here: https://open-sdg.readthedocs.io/en/latest/data-configuration/#languages')
 
-    # Perform per-indicator callbacks.
+    # Optionally validate the same indicators that are about to be built.
+    if options['validate'] and not open_sdg_validate(outputs):
+        print('Validation failed, so the build was not run.')
+        return False
+
+    # Schedule the outputs, which can run concurrently because they only share
+    # the already-merged indicators.
+    scheduler = sdg.BuildScheduler(max_workers=options['output_workers'], logging=options['logging'])
+    if scheduler.max_workers is not None and scheduler.max_workers > 1:
+        # Alter the indicators up front, rather than inside concurrent outputs.
+        for output in outputs:
+            if not output.already_altered_indicators:
+                output.alter_indicators()
+    output_task_names = open_sdg_output_task_names(outputs)
+    if options['stream_languages']:
+        open_sdg_add_language_streaming_tasks(scheduler, outputs, output_task_names, options)
+    else:
+        for output, task_name in zip(outputs, output_task_names):
+            scheduler.add_task(task_name, open_sdg_output_task(output, options))
+
+    # Perform per-indicator callbacks. These may alter the indicators, which
+    # are shared between the outputs, so they wait for all of the outputs and
+    # run one at a time.
+    callback_task_names = []
     if callable(options['indicator_callback']):
         indicator_callback = options['indicator_callback']
-        for output in outputs:
+        for output, task_name in zip(outputs, output_task_names):
             if isinstance(output, sdg.outputs.OutputOpenSdg):
-                for indicator in output.indicators.values():
-                    indicator_callback(indicator)
-
-    # Output the documentation pages.
-    documentation_service = sdg.OutputDocumentationService(outputs,
-        folder=options['site_dir'],
-        subfolder=options['docs_subfolder'],
-        branding=options['docs_branding'],
-        intro=options['docs_intro'],
-        languages=options['languages'],
-        translations=options['translations'],
-        indicator_url=options['docs_indicator_url'],
-        baseurl=options['docs_baseurl'],
-        extra_disaggregations=options['docs_extra_disaggregations'],
-        translate_disaggregations=options['docs_translate_disaggregations'],
-        logging=logging,
-        metadata_fields=options['docs_metadata_fields'],
-    )
-    documentation_service.generate_documentation()
+                def callback_task(output=output):
+                    for indicator in output.indicators.values():
+                        indicator_callback(indicator)
+                callback_task_name = 'Indicator callback: ' + task_name
+                scheduler.add_task(callback_task_name, callback_task,
+                    depends_on=output_task_names + callback_task_names[-1:])
+                callback_task_names.append(callback_task_name)
+
+    # Output the documentation pages, once everything else is finished.
+    def documentation_task():
+        documentation_service = sdg.OutputDocumentationService(outputs,
+            folder=options['site_dir'],
+            subfolder=options['docs_subfolder'],
+            branding=options['docs_branding'],
+            intro=options['docs_intro'],
+            languages=options['languages'],
+            translations=options['translations'],
+            indicator_url=options['docs_indicator_url'],
+            baseurl=options['docs_baseurl'],
+            extra_disaggregations=options['docs_extra_disaggregations'],
+            translate_disaggregations=options['docs_translate_disaggregations'],
+            logging=options['logging'],
+            metadata_fields=options['docs_metadata_fields'],
+        )
+        documentation_service.generate_documentation()
+    scheduler.add_task('Documentation', documentation_task,
+        depends_on=output_task_names + callback_task_names)
+
+    status = status & scheduler.run()
+
+    for task_name, seconds in scheduler.get_timings().items():
+        scheduler.debug('{task_name} took {seconds:.3f}s', task_name=task_name, seconds=seconds)
 
     return status
 
 
+def open_sdg_output_task(output, options):
+    """Get a task for the BuildScheduler that builds one output.
+
+    Args:
+        output: OutputBase. The output to build.
+        options: Dict of options.
+
+    Returns:
+        A function which builds all the languages and returns a status.
+    """
+    def output_task():
+        status = output.execute_per_language(options['languages'],
+            workers=options['language_workers'])
+        status = status & output.execute('untranslated')
+        return status
+    return output_task
+
+
+def open_sdg_add_language_streaming_tasks(scheduler, outputs, output_task_names, options):
+    """Schedule the outputs so that only one language is built at a time.
+
+    Each language is built for all of the outputs, and then the translated
+    indicators for that language are forgotten before the next language
+    starts. The untranslated builds come last, in tasks named after the
+    outputs, so that other tasks can depend on them as usual.
+
+    Args:
+        scheduler: BuildScheduler. The scheduler to add the tasks to.
+        outputs: list. The prepared OutputBase objects.
+        output_task_names: list. The names from open_sdg_output_task_names().
+        options: Dict of options.
+    """
+    languages = options['languages']
+    for output in outputs:
+        output.all_languages = languages
+
+    previous_task_names = []
+    for language in languages:
+        language_task_names = []
+        for output, task_name in zip(outputs, output_task_names):
+            language_task_name = task_name + ': ' + language
+            def language_task(output=output, language=language):
+                return output.execute(language)
+            scheduler.add_task(language_task_name, language_task, depends_on=previous_task_names)
+            language_task_names.append(language_task_name)
+        def clear_task(language=language):
+            for output in outputs:
+                output.clear_translations(language)
+        clear_task_name = 'Clear translations: ' + language
+        scheduler.add_task(clear_task_name, clear_task, depends_on=language_task_names)
+        previous_task_names = [clear_task_name]
+
+    for output, task_name in zip(outputs, output_task_names):
+        def untranslated_task(output=output):
+            return output.execute('untranslated')
+        scheduler.add_task(task_name, untranslated_task, depends_on=previous_task_names)
+
+
+def open_sdg_output_task_names(outputs):
+    """Get unique names for the outputs, for use in the BuildScheduler.
+
+    Args:
+        outputs: list. The prepared OutputBase objects.
+
+    Returns:
+        List of strings, in the same order as the outputs.
+    """
+    names = []
+    for output in outputs:
+        name = type(output).__name__
+        suffix = 2
+        while name in names:
+            name = type(output).__name__ + ' (' + str(suffix) + ')'
+            suffix += 1
+        names.append(name)
+    return names
+
+
 def open_sdg_indicator_options_defaults():
     return {
         'non_disaggregation_columns': [
@@ -217,6 +396,7 @@ def open_sdg_indicator_options_defaults():
         ],
         'series_column': 'Series',
         'unit_column': 'Units',
+        'categorical_columns': False,
     }
 
 
@@ -230,12 +410,15 @@ def open_sdg_indicator_options_from_dict(options):
         options_obj.set_series_column(options['series_column'])
     if 'unit_column' in options:
         options_obj.set_unit_column(options['unit_column'])
+    if 'categorical_columns' in options:
+        options_obj.set_categorical_columns(options['categorical_columns'])
     return options_obj
 
 
 def open_sdg_check(src_dir='', schema_file='_prose.yml', config='open_sdg_config.yml',
         inputs=None, alter_data=None, alter_meta=None, indicator_options=None,
-        data_schema=None, schema=None, logging=None, alter_indicator=None):
+        data_schema=None, schema=None, logging=None, alter_indicator=None,
+        cache_dir=None):
     """Run validation checks for all indicators.
 
     This checks both *.csv (data) and *.md (metadata) files.
@@ -253,6 +436,8 @@ def open_sdg_check(src_dir='', schema_file='_prose.yml', config='open_sdg_config
         alter_indicator: function. A callback function that alters the full Indicator objects (for each output)
         data_schema: dict . Dict describing an instance of DataSchemaInputBase
         logging: Noneor list. Type of logs to print, including 'warn' and 'debug'
+        cache_dir: str. Optional folder in which to cache the merged indicators,
+            so that a following build can skip reading inputs.
 
     Returns:
         boolean: True if the check was successful, False if not.
@@ -281,6 +466,7 @@ def open_sdg_check(src_dir='', schema_file='_prose.yml', config='open_sdg_config
         'logging': logging,
         'indicator_export_filename': None,
         'ignore_out_of_scope_disaggregation_stats': False,
+        'cache_dir': cache_dir,
     }
     # Allow for a config file to update these.
     options = open_sdg_config(config, defaults)
@@ -303,6 +489,34 @@ def open_sdg_check(src_dir='', schema_file='_prose.yml', config='open_sdg_config
     # Prepare and validate the output.
     outputs = open_sdg_prep(options)
 
+    return open_sdg_validate(outputs)
+
+
+def open_sdg_check_and_build(**kwargs):
+    """Validate all indicators and then, if successful, build them.
+
+    The inputs are only read and merged once, and the build uses the same
+    indicators that were validated. Nothing is written if validation fails.
+
+    Args:
+        Accepts the same arguments as open_sdg_build().
+
+    Returns:
+        Boolean status of the validation and file writes
+    """
+    kwargs['validate'] = True
+    return open_sdg_build(**kwargs)
+
+
+def open_sdg_validate(outputs):
+    """Run validation checks for all indicators in some prepared outputs.
+
+    Args:
+        outputs: list. The prepared OutputBase objects.
+
+    Returns:
+        boolean: True if the check was successful, False if not.
+    """
     status = True
     for output in outputs:
         status = status & output.validate()
@@ -343,6 +557,14 @@ def open_sdg_prep(options):
     if 'reporting_status_extra_fields' in options:
         reporting_status_extra_fields = options['reporting_status_extra_fields']
 
+    # Optionally write the Open SDG indicators in parallel.
+    workers = options['workers'] if 'workers' in options else 1
+    worker_type = options['worker_type'] if 'worker_type' in options else 'thread'
+    # Optionally skip the Open SDG indicators that have not changed.
+    incremental = options['incremental'] if 'incremental' in options else False
+    # Optionally cache the merged indicators between processes.
+    cache_dir = options['cache_dir'] if 'cache_dir' in options else None
+
     # Create an "output" from these inputs/schema/translations, for Open SDG output.
     opensdg_output = sdg.outputs.OutputOpenSdg(
         inputs=inputs,
@@ -355,6 +577,10 @@ def open_sdg_prep(options):
         logging=options['logging'],
         indicator_export_filename=options['indicator_export_filename'],
         ignore_out_of_scope_disaggregation_stats=options['ignore_out_of_scope_disaggregation_stats'],
+        workers=workers,
+        worker_type=worker_type,
+        incremental=incremental,
+        cache_dir=cache_dir,
     )
 
     if callable(options['alter_indicator']):
@@ -1,15 +1,66 @@
 import os
+import glob
+import json
+import pickle
+import hashlib
+import threading
+import pandas as pd
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from sdg.IndicatorOptions import IndicatorOptions
 from sdg.translations import TranslationInputBase
 from sdg.translations import TranslationHelper
 from sdg.Loggable import Loggable
 
+# Per-thread storage for the build contexts of outputs, keyed by output id.
+_build_contexts = threading.local()
+
+
+class BuildContextAttribute:
+    """An output attribute which can hold a separate value per build.
+
+    While an output is executing (see OutputBase.build_context) any values
+    assigned to this attribute are only visible to the current thread, so that
+    several languages can be built at the same time. Outside of a build the
+    attribute behaves like a normal instance attribute.
+    """
+
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        context = obj.get_build_context()
+        if context is not None and self.name in context:
+            return context[self.name]
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+    def __set__(self, obj, value):
+        context = obj.get_build_context()
+        if context is not None:
+            context[self.name] = value
+        else:
+            obj.__dict__[self.name] = value
+
+
 class OutputBase(Loggable):
     """Base class for destinations of SDG data/metadata."""
 
 
+    # The output folder changes for each language being built.
+    output_folder = BuildContextAttribute()
+
+
     def __init__(self, inputs, schema, output_folder='_site', translations=None,
-                 indicator_options=None, logging=None, request_params=None):
+                 indicator_options=None, logging=None, request_params=None,
+                 cache_dir=None):
         """Constructor for OutputBase.
 
         inputs: list
@@ -29,9 +80,13 @@ class OutputBase(Loggable):
             Optional dict of parameters to be passed to remote file fetches.
             Corresponds to the options passed to a urllib.request.Request.
             @see https://docs.python.org/3/library/urllib.request.html#urllib.request.Request
+        cache_dir : string or None
+            Optional folder in which to cache the merged indicators between
+            processes. This only applies if all of the inputs support caching.
         """
         Loggable.__init__(self, logging=logging)
         self.request_params = request_params
+        self.cache_dir = cache_dir
         if translations is None:
             translations = []
         self.indicator_options = IndicatorOptions() if indicator_options is None else indicator_options
@@ -39,7 +94,8 @@ class OutputBase(Loggable):
         self.indicator_alterations = []
         self.already_altered_indicators = False
 
-        self.indicators = self.merge_inputs(inputs)
+        with self.span('Merge inputs: ' + type(self).__name__, category='merge'):
+            self.indicators = self.merge_inputs(inputs)
         self.schema = schema
         self.output_folder = output_folder
         self.translations = translations
@@ -68,31 +124,101 @@ class OutputBase(Loggable):
         if not self.already_altered_indicators:
             self.alter_indicators()
 
-        # Keep a backup of the output folder.
-        original_output_folder = self.output_folder
+        stage_name = 'Output: ' + type(self).__name__ + ' (' + str(language) + ')'
+        with self.build_context(), self.span(stage_name, category='output', language=language):
+            original_output_folder = self.output_folder
 
-        if language == 'untranslated':
-            self.output_folder = os.path.join(original_output_folder, 'untranslated')
-            language = None
+            if language == 'untranslated':
+                self.output_folder = os.path.join(original_output_folder, 'untranslated')
+                language = None
 
-        if language:
-            self.debug('Translating indicators into {lang}', lang=language)
-            # Temporarily change the output folder.
-            self.output_folder = os.path.join(original_output_folder, language)
-            # Translate each indicator.
-            for inid in self.indicators:
+            if language:
+                self.debug('Translating indicators into {lang}', lang=language)
+                # Change the output folder for this build only.
+                self.output_folder = os.path.join(original_output_folder, language)
+                # Translate each indicator, unless the build does this itself.
+                if self.translate_before_build(language):
+                    self.translate_indicators(language)
+                # Track our languages for use later.
+                if language not in self.all_languages:
+                    self.all_languages.append(language)
+
+            # Now perform the build.
+            status = self.build(language)
+
+        return status
+
+
+    def translate_before_build(self, language):
+        """Whether to translate all of the indicators before building a language.
+
+        Subclasses can override this to return False, if build() translates
+        the indicators it needs by calling translate_indicators() itself.
+
+        Parameters
+        ----------
+        language : string
+            The language about to be built.
+
+        Returns
+        -------
+        boolean
+        """
+        return True
+
+
+    def translate_indicators(self, language, indicator_ids=None):
+        """Translate the indicators of this output into a language.
+
+        Parameters
+        ----------
+        language : string
+            The language code to translate into.
+        indicator_ids : list or None
+            The ids of the indicators to translate. Defaults to all of them.
+        """
+        if indicator_ids is None:
+            indicator_ids = list(self.indicators)
+        for inid in indicator_ids:
+            with self.span('translate', indicator=self.indicators[inid]):
                 self.indicators[inid].translate(language, self.translation_helper)
-            # Track our languages for use later.
-            if language not in self.all_languages:
-                self.all_languages.append(language)
 
-        # Now perform the build.
-        status = self.build(language)
 
-        # Cleanup afterwards.
-        self.output_folder = original_output_folder
+    @contextmanager
+    def build_context(self):
+        """Isolate any BuildContextAttribute values for the duration of a build.
 
-        return status
+        Values assigned inside the context are only visible to the current
+        thread, and are discarded when the context ends.
+        """
+        contexts = getattr(_build_contexts, 'contexts', None)
+        if contexts is None:
+            contexts = {}
+            _build_contexts.contexts = contexts
+        key = id(self)
+        previous = contexts.get(key)
+        contexts[key] = {} if previous is None else dict(previous)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del contexts[key]
+            else:
+                contexts[key] = previous
+
+
+    def get_build_context(self):
+        """Get the values of the current thread's build context, if any.
+
+        Returns
+        -------
+        dict or None
+            The build context values, or None if not currently building.
+        """
+        contexts = getattr(_build_contexts, 'contexts', None)
+        if contexts is None:
+            return None
+        return contexts.get(id(self))
 
 
     def build(self, language=None):
@@ -114,8 +240,19 @@ class OutputBase(Loggable):
         # we check the first input for already-merged indicators.
         if inputs[0].has_merged_indicators(inputs):
             return inputs[0].get_merged_indicators()
+        # Or they may have been cached on disk by a previous process.
+        cache_path = self.get_cache_path(inputs)
+        if cache_path is not None:
+            merged_indicators = self.read_cache(cache_path)
+            if merged_indicators is not None:
+                inputs[0].set_merged_indicators(merged_indicators, inputs)
+                return merged_indicators
         # Otherwise we continue on.
         merged_indicators = {}
+        # The indicators from later inputs are collected, so that their data can
+        # be concatenated once at the end. Only the indicators are kept here,
+        # because the data of lazy indicators is loaded when needed.
+        extra_indicators = {}
         for input in inputs:
             # Fetch the input.
             input.execute_once(self.indicator_options)
@@ -129,24 +266,110 @@ class OutputBase(Loggable):
                     # be "merged" in. To do this, we manually set data, metadata,
                     # and name. Note that all of these "set" methods abort if
                     # the value is None, so we don't need to check for None here.
-                    merged_indicators[inid].set_data(input.indicators[inid].data)
+                    extra_indicators.setdefault(inid, []).append(input.indicators[inid])
                     merged_indicators[inid].set_meta(input.indicators[inid].meta)
                     merged_indicators[inid].set_name(input.indicators[inid].name)
 
+        for inid in extra_indicators:
+            merged_indicators[inid].add_data([indicator.data for indicator in extra_indicators[inid]])
+
         for inid in merged_indicators:
             # Now that everything has been merged, we have to make sure that
             # minimum data and metadata is set.
             merged_indicators[inid].require_data()
             merged_indicators[inid].require_meta(self.minimum_metadata(merged_indicators[inid]))
-            # And because this may affect data, we have to re-do headlines and
-            # edges.
-            merged_indicators[inid].set_headline()
-            merged_indicators[inid].set_edges()
 
+        if cache_path is not None:
+            self.write_cache(cache_path, merged_indicators)
         inputs[0].set_merged_indicators(merged_indicators, inputs)
         return merged_indicators
 
 
+    def get_cache_path(self, inputs):
+        """Get the path to the cache file for the merged indicators, if any.
+
+        The filename is made of two hashes: one identifying the set of inputs
+        (so that stale files can be found) and one identifying their content.
+
+        Parameters
+        ----------
+        inputs : list
+            A list of InputBase (or descendent) classes.
+
+        Returns
+        -------
+        string or None
+            The path, or None if caching is disabled or unsupported.
+        """
+        if self.cache_dir is None:
+            return None
+        input_keys = [input.get_cache_key() for input in inputs]
+        if any(input_key is None for input_key in input_keys):
+            self.debug('Not caching indicators because some inputs do not support it.')
+            return None
+        input_set = [type(self).__name__] + [type(input).__name__ for input in inputs]
+        content = {
+            'inputs': input_keys,
+            'indicator_options': vars(self.indicator_options),
+            'pandas': pd.__version__,
+        }
+        set_hash = hashlib.sha256(json.dumps(input_set).encode('utf-8')).hexdigest()[:16]
+        content_hash = hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, set_hash + '-' + content_hash + '.pickle')
+
+
+    def read_cache(self, cache_path):
+        """Read merged indicators from a cache file.
+
+        Parameters
+        ----------
+        cache_path : string
+            The path from get_cache_path().
+
+        Returns
+        -------
+        dict or None
+            Dict of Indicator objects keyed by id, or None if not cached.
+        """
+        if not os.path.isfile(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                merged_indicators = pickle.load(f)
+        except Exception as e:
+            self.warn('Unable to read cache file {path}: {error}', path=cache_path, error=str(e))
+            return None
+        self.debug('Using cached indicators from {path}', path=cache_path)
+        return merged_indicators
+
+
+    def write_cache(self, cache_path, merged_indicators):
+        """Write merged indicators to a cache file, removing stale files.
+
+        Parameters
+        ----------
+        cache_path : string
+            The path from get_cache_path().
+        merged_indicators : dict
+            Dict of Indicator objects keyed by id.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        set_hash = os.path.basename(cache_path).split('-')[0]
+        for stale_path in glob.glob(os.path.join(self.cache_dir, set_hash + '-*.pickle')):
+            if stale_path != cache_path:
+                os.remove(stale_path)
+        # Write to a temporary file first, so that no partial files are read.
+        temp_path = cache_path + '.' + str(os.getpid()) + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump(merged_indicators, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            self.warn('Unable to write cache file {path}: {error}', path=cache_path, error=str(e))
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+
+
     def validate(self):
         """Validate the data and metadata for the indicators."""
 
@@ -157,16 +380,49 @@ class OutputBase(Loggable):
         return status
 
 
-    def execute_per_language(self, languages):
-        """This helper triggers calls to execute() for each language."""
+    def execute_per_language(self, languages, workers=1):
+        """This helper triggers calls to execute() for each language.
+
+        Parameters
+        ----------
+        languages : list
+            The language codes to build.
+        workers : int
+            The number of languages to build at the same time. The untranslated
+            indicators are shared (read-only) between the concurrent builds.
+        """
         status = True
         self.all_languages = languages
-        for language in languages:
-            status = status & self.execute(language)
+        if workers is None or workers <= 1 or len(languages) < 2:
+            for language in languages:
+                status = status & self.execute(language)
+            return status
+
+        # Alter the indicators up front, rather than inside concurrent builds.
+        if not self.already_altered_indicators:
+            self.alter_indicators()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for language_status in pool.map(self.execute, languages):
+                status = status & language_status
 
         return status
 
 
+    def clear_translations(self, language=None):
+        """Forget the translated copies of this output's indicators.
+
+        This also forgets the translated text looked up for those languages.
+
+        Parameters
+        ----------
+        language : string or None
+            The language code to forget. If None, all languages are forgotten.
+        """
+        for inid in self.indicators:
+            self.indicators[inid].clear_translations(language)
+        self.translation_helper.clear_lookups(language)
+
+
     def minimum_metadata(self, indicator):
         """Each subclass can specify it's own minimum viable metadata values.
 
@@ -208,8 +464,10 @@ class OutputBase(Loggable):
 
 
     def alter_indicators(self):
-        for inid in self.indicators:
-            self.indicators[inid] = self.alter_indicator(self.indicators[inid])
+        with self.span('Alter indicators: ' + type(self).__name__, category='alteration'):
+            for inid in self.indicators:
+                with self.span('alter', indicator=self.indicators[inid]):
+                    self.indicators[inid] = self.alter_indicator(self.indicators[inid])
         self.already_altered_indicators = True
 
 
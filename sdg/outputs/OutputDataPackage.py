@@ -2,6 +2,7 @@
 
 import os
 from sdg.outputs import OutputBase
+from sdg.outputs.OutputBase import BuildContextAttribute
 from sdg.data_schemas import DataSchemaInputIndicator
 from frictionless import Schema
 from frictionless import Package
@@ -13,6 +14,10 @@ class OutputDataPackage(OutputBase):
     """Output a tabular data package (https://specs.frictionlessdata.io/data-package/).
     """
 
+
+    # The top-level package is assembled separately for each language.
+    top_level_package = BuildContextAttribute()
+
     def __init__(self, inputs, schema, output_folder='_site', translations=None,
         indicator_options=None, data_schema=None, package_properties=None,
         resource_properties=None, field_properties=None, sorting='default',
@@ -74,10 +79,13 @@ class OutputDataPackage(OutputBase):
         self.create_top_level_package('all', 'All indicators')
 
         backup_data_schema = DataSchemaInputIndicator(source=self.indicators)
+        # Use a local variable so that concurrent language builds each make
+        # the same decisions about sorting.
+        data_schema = self.data_schema
         data_schema_not_specified = False
-        if self.data_schema is None:
+        if data_schema is None:
             data_schema_not_specified = True
-            self.data_schema = backup_data_schema
+            data_schema = backup_data_schema
 
         for indicator_id in self.get_indicator_ids():
             # Make sure the folder exists.
@@ -86,7 +94,7 @@ class OutputDataPackage(OutputBase):
 
             indicator = self.get_indicator_by_id(indicator_id).language(language)
             backup_schema_was_used = False
-            data_schema_for_indicator = self.data_schema.get_schema_for_indicator(indicator)
+            data_schema_for_indicator = data_schema.get_schema_for_indicator(indicator)
             if data_schema_for_indicator is None:
                 backup_schema_was_used = True
                 data_schema_for_indicator = backup_data_schema.get_schema_for_indicator(indicator)
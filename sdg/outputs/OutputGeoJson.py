@@ -116,7 +116,11 @@ class OutputGeoJson(OutputBase):
         if self.id_column not in cols:
             return False
         # Make sure that column has data in it.
-        return indicator.data[self.id_column].any()
+        column = indicator.data[self.id_column]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Categoricals do not support any().
+            column = column.astype(object)
+        return column.any()
 
 
     def build(self, language=None):
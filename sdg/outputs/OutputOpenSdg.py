@@ -1,8 +1,11 @@
 import os
 import sdg
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from sdg.outputs import OutputBase
 from sdg.data import write_csv
 from sdg.json import write_json, df_to_list_dict
+from sdg.path import output_path
 
 class OutputOpenSdg(OutputBase):
     """Output SDG data/metadata in the formats expected by Open SDG."""
@@ -11,7 +14,8 @@ class OutputOpenSdg(OutputBase):
     def __init__(self, inputs, schema, output_folder='_site', translations=None,
         reporting_status_extra_fields=None, indicator_options=None,
         indicator_downloads=None, logging=None, indicator_export_filename='all_indicators',
-        ignore_out_of_scope_disaggregation_stats=False):
+        ignore_out_of_scope_disaggregation_stats=False, workers=1, worker_type='thread',
+        incremental=False, cache_dir=None):
         """Constructor for OutputOpenSdg.
 
         Parameters
@@ -28,16 +32,34 @@ class OutputOpenSdg(OutputBase):
             A filename (without the extension) for the zipped indicator export.
         ignore_out_of_scope_disaggregation_stats : boolean
             Whether to ignore the "not applicable" disaggregation stats.
+        workers : int
+            The number of indicators to write in parallel. The default of 1
+            writes the indicators one after another.
+        worker_type : string
+            Either 'thread' or 'process', to choose the kind of pool that is
+            used when workers is greater than 1.
+        incremental : boolean
+            Whether to skip writing indicators that have not changed since the
+            last build into the same folder, according to a manifest file. The
+            aggregate files are also skipped if no indicators have changed.
+        cache_dir : string or None
+            Optional folder in which to cache the merged indicators, so that
+            other processes using the same inputs do not need to re-read them.
         """
+        if worker_type not in ['thread', 'process']:
+            raise ValueError('The worker_type must be either "thread" or "process".')
         if translations is None:
             translations = []
 
         OutputBase.__init__(self, inputs, schema, output_folder, translations,
-                            indicator_options, logging=logging)
+                            indicator_options, logging=logging, cache_dir=cache_dir)
         self.reporting_status_grouping_fields = reporting_status_extra_fields
         self.indicator_downloads = indicator_downloads
         self.indicator_export_filename = indicator_export_filename
         self.ignore_na = ignore_out_of_scope_disaggregation_stats
+        self.workers = workers
+        self.worker_type = worker_type
+        self.incremental = incremental
 
 
     def build(self, language=None):
@@ -61,49 +83,69 @@ class OutputOpenSdg(OutputBase):
             filename='translations.json'
         )
 
-        for indicator_id in self.get_indicator_ids():
-            indicator = self.get_indicator_by_id(indicator_id).language(language)
-            # Output all the csvs
-            status = status & write_csv(indicator_id, indicator.data, ftype='data', site_dir=site_dir)
-            status = status & write_csv(indicator_id, indicator.edges, ftype='edges', site_dir=site_dir)
-            status = status & write_csv(indicator_id, indicator.headline, ftype='headline', site_dir=site_dir)
-            # And JSON
-            data_dict = df_to_list_dict(indicator.data, orient='list')
-            edges_dict = df_to_list_dict(indicator.edges, orient='list')
-            headline_dict = df_to_list_dict(indicator.headline, orient='records')
-
-            status = status & write_json(indicator_id, data_dict, ftype='data', gz=False, site_dir=site_dir)
-            status = status & write_json(indicator_id, edges_dict, ftype='edges', gz=False, site_dir=site_dir)
-            status = status & write_json(indicator_id, headline_dict, ftype='headline', gz=False, site_dir=site_dir)
-
-            # combined
-            comb = {'data': data_dict, 'edges': edges_dict}
-            status = status & write_json(indicator_id, comb, ftype='comb', gz=False, site_dir=site_dir)
-
-            # Metadata
-            status = status & sdg.json.write_json(indicator_id, indicator.meta, ftype='meta', site_dir=site_dir)
-
-            # Append to the build-time "all" output
-            all_meta[indicator_id] = indicator.meta
-            all_headline[indicator_id] = headline_dict
-
-        status = status & sdg.json.write_json('all', all_meta, ftype='meta', site_dir=site_dir)
-        status = status & sdg.json.write_json('all', all_headline, ftype='headline', site_dir=site_dir)
-
-        # Reporting status.
-        stats_reporting = sdg.stats.reporting_status(all_meta, self.reporting_status_grouping_fields)
-        status = status & sdg.json.write_json('reporting', stats_reporting, ftype='stats', site_dir=site_dir)
-
-        disaggregation_status_service = sdg.DisaggregationStatusService(
-            site_dir,
-            self.indicators,
-            self.reporting_status_grouping_fields,
-            self.ignore_na,
-        )
-        disaggregation_status_service.write_json()
-
-        indicator_export_service = sdg.IndicatorExportService(site_dir, self.indicators, filename=self.indicator_export_filename)
-        indicator_export_service.export_all_indicator_data_as_zip_archive()
+        indicator_ids = list(self.get_indicator_ids())
+
+        # In incremental builds, only write the indicators that have changed.
+        # This is decided before translating, using the untranslated
+        # indicators (the translations themselves are part of the settings).
+        manifest = None
+        changed = [True] * len(indicator_ids)
+        aggregates_unchanged = False
+        if self.incremental:
+            manifest = sdg.BuildManifest(site_dir, settings=self.get_manifest_settings(language), logging=self.logging)
+            # Indicators which are no longer in the inputs are removed from the
+            # site, as they would be missing from a full build.
+            for indicator_id in manifest.get_removed_indicator_ids(indicator_ids):
+                self.debug('Removing the files of indicator {indicator_id}, which is no longer present.', indicator_id=indicator_id)
+                self.remove_indicator_files(indicator_id, site_dir)
+            indicator_hashes = [manifest.get_indicator_hash(self.get_indicator_by_id(indicator_id)) for indicator_id in indicator_ids]
+            for index, indicator_id in enumerate(indicator_ids):
+                if manifest.is_unchanged(indicator_id, indicator_hashes[index]) and self.indicator_files_exist(indicator_id, site_dir):
+                    changed[index] = False
+                    manifest.set_indicator_hash(indicator_id, indicator_hashes[index])
+            self.debug('Writing {num} of {total} indicators', num=sum(changed), total=len(changed))
+            aggregates_unchanged = (not any(changed) and manifest.aggregates_unchanged()
+                                    and self.aggregate_files_exist(site_dir))
+            # The aggregate files need all of the indicators translated, but
+            # otherwise only the changed indicators are translated.
+            if language:
+                if aggregates_unchanged:
+                    self.translate_indicators(language, [indicator_id for indicator_id, is_changed in zip(indicator_ids, changed) if is_changed])
+                else:
+                    self.translate_indicators(language)
+
+        if aggregates_unchanged:
+            # Only the changed indicators (if any) are needed.
+            indicators = [self.get_indicator_by_id(indicator_id).language(language) if is_changed else None
+                          for indicator_id, is_changed in zip(indicator_ids, changed)]
+        else:
+            indicators = [self.get_indicator_by_id(indicator_id).language(language) for indicator_id in indicator_ids]
+
+        changed_ids = [indicator_id for indicator_id, is_changed in zip(indicator_ids, changed) if is_changed]
+        changed_indicators = [indicator for indicator, is_changed in zip(indicators, changed) if is_changed]
+        results = iter(self.map_indicators(OutputOpenSdg.write_indicator, changed_ids, changed_indicators, site_dir))
+
+        # Gather the build-time "all" output in a deterministic order.
+        for index, indicator_id in enumerate(indicator_ids):
+            indicator = indicators[index]
+            if changed[index]:
+                indicator_status, headline_dict = next(results)
+                status = status & indicator_status
+                if manifest is not None and indicator_status:
+                    manifest.set_indicator_hash(indicator_id, indicator_hashes[index])
+            else:
+                headline_dict = None
+            if not aggregates_unchanged:
+                all_meta[indicator_id] = indicator.meta
+                all_headline[indicator_id] = headline_dict
+
+        if aggregates_unchanged:
+            self.debug('Skipping the aggregate files, since no indicators have changed.')
+            manifest.write(aggregates=status)
+        else:
+            status = status & self.write_aggregates(all_meta, all_headline, indicators, site_dir)
+            if manifest is not None:
+                manifest.write(aggregates=status)
 
         # Write the indicator downloads.
         if self.indicator_downloads is not None:
@@ -120,6 +162,276 @@ class OutputOpenSdg(OutputBase):
         return(status)
 
 
+    def write_aggregates(self, all_meta, all_headline, indicators, site_dir):
+        """Write the files which combine all of the indicators.
+
+        Parameters
+        ----------
+        all_meta : dict
+            The metadata of each indicator, keyed by indicator id.
+        all_headline : dict
+            The headline of each indicator as a list of dicts, keyed by
+            indicator id. Any None values are computed from the indicators.
+        indicators : list
+            The (possibly translated) Indicator objects, in the same order
+            as the keys of all_headline.
+        site_dir : string
+            The folder to write to.
+
+        Returns
+        -------
+        boolean
+            The status of the writes.
+        """
+        status = True
+        for indicator, indicator_id in zip(indicators, all_headline):
+            if all_headline[indicator_id] is None:
+                all_headline[indicator_id] = df_to_list_dict(indicator.headline, orient='records')
+
+        status = status & sdg.json.write_json('all', all_meta, ftype='meta', site_dir=site_dir)
+        status = status & sdg.json.write_json('all', all_headline, ftype='headline', site_dir=site_dir)
+
+        # Reporting status.
+        stats_reporting = sdg.stats.reporting_status(all_meta, self.reporting_status_grouping_fields)
+        status = status & sdg.json.write_json('reporting', stats_reporting, ftype='stats', site_dir=site_dir)
+
+        with self.span('DisaggregationStatusService', category='service'):
+            disaggregation_status_service = sdg.DisaggregationStatusService(
+                site_dir,
+                self.indicators,
+                self.reporting_status_grouping_fields,
+                self.ignore_na,
+            )
+            disaggregation_status_service.write_json()
+
+        with self.span('IndicatorExportService', category='service'):
+            indicator_export_service = sdg.IndicatorExportService(site_dir, self.indicators, filename=self.indicator_export_filename)
+            indicator_export_service.export_all_indicator_data_as_zip_archive()
+
+        return status
+
+
+    def get_manifest_settings(self, language=None):
+        """Get the configuration that affects every file, for incremental builds.
+
+        Parameters
+        ----------
+        language : string or None
+            The language being built.
+
+        Returns
+        -------
+        dict
+            JSON-serializable settings for BuildManifest.
+        """
+        return {
+            'class': type(self).__name__,
+            'language': language,
+            'reporting_status_extra_fields': self.reporting_status_grouping_fields,
+            'indicator_export_filename': self.indicator_export_filename,
+            'ignore_out_of_scope_disaggregation_stats': self.ignore_na,
+            'indicator_options': vars(self.indicator_options),
+            'translations': self.get_translations_for_manifest(language),
+        }
+
+
+    def get_translations_for_manifest(self, language=None):
+        """Get all of the translations into a language, for incremental builds.
+
+        Parameters
+        ----------
+        language : string or None
+            The language being built.
+
+        Returns
+        -------
+        dict or None
+            The translated text, keyed by translation key.
+        """
+        if not language:
+            return None
+        translation_keys = self.translation_helper.translation_keys
+        return {key: translation_keys[key][language] for key in translation_keys if language in translation_keys[key]}
+
+
+    def translate_before_build(self, language):
+        """Incremental builds only translate the indicators they need. Overrides parent."""
+        return not self.incremental
+
+
+    def indicator_files_exist(self, indicator_id, site_dir):
+        """Check whether the files for an indicator were previously written.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        site_dir : string
+            The folder to check.
+
+        Returns
+        -------
+        boolean
+        """
+        return all(os.path.isfile(path) for path in self.get_indicator_file_paths(indicator_id, site_dir))
+
+
+    def remove_indicator_files(self, indicator_id, site_dir):
+        """Delete any previously written files for an indicator.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        site_dir : string
+            The folder containing the files.
+        """
+        for path in self.get_indicator_file_paths(indicator_id, site_dir):
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+    def get_indicator_file_paths(self, indicator_id, site_dir):
+        """Get the paths of all of the files written for an indicator.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        site_dir : string
+            The folder containing the files.
+
+        Returns
+        -------
+        list
+        """
+        return [
+            output_path(indicator_id, ftype=ftype, format='csv', site_dir=site_dir)
+            for ftype in ['data', 'edges', 'headline']
+        ] + [
+            output_path(indicator_id, ftype=ftype, format='json', site_dir=site_dir)
+            for ftype in ['data', 'edges', 'headline', 'comb', 'meta']
+        ]
+
+
+    def aggregate_files_exist(self, site_dir):
+        """Check whether the files combining all indicators were previously written.
+
+        Parameters
+        ----------
+        site_dir : string
+            The folder to check.
+
+        Returns
+        -------
+        boolean
+        """
+        paths = [
+            output_path('all', ftype='meta', format='json', site_dir=site_dir),
+            output_path('all', ftype='headline', format='json', site_dir=site_dir),
+            output_path('reporting', ftype='stats', format='json', site_dir=site_dir),
+            output_path('disaggregation', ftype='stats', format='json', site_dir=site_dir),
+            os.path.join(site_dir, 'zip', self.indicator_export_filename + '.zip'),
+            os.path.join(site_dir, 'zip', 'all_indicators.json'),
+        ]
+        return all(os.path.isfile(path) for path in paths)
+
+
+    def map_indicators(self, function, indicator_ids, indicators, site_dir):
+        """Run a per-indicator function, possibly in parallel.
+
+        Parameters
+        ----------
+        function : function
+            A function accepting an indicator id, an Indicator and a site
+            directory. For process pools this must be picklable.
+        indicator_ids : list
+            The indicator ids to process.
+        indicators : list
+            The Indicator objects corresponding to indicator_ids.
+        site_dir : string
+            The folder to write to.
+
+        Returns
+        -------
+        list
+            The return values of the function, in the order of indicator_ids.
+        """
+        functions = [function] * len(indicator_ids)
+        site_dirs = [site_dir] * len(indicator_ids)
+        if self.workers is None or self.workers <= 1 or len(indicator_ids) < 2:
+            timed_results = list(map(OutputOpenSdg.call_timed, functions, indicator_ids, indicators, site_dirs))
+        else:
+            pool_class = ProcessPoolExecutor if self.worker_type == 'process' else ThreadPoolExecutor
+            with pool_class(max_workers=self.workers) as pool:
+                timed_results = list(pool.map(OutputOpenSdg.call_timed, functions, indicator_ids, indicators, site_dirs))
+
+        results = []
+        for indicator, (start, seconds, result) in zip(indicators, timed_results):
+            self.add_span(function.__name__, start, seconds, indicator=indicator)
+            results.append(result)
+        return results
+
+
+    @staticmethod
+    def call_timed(function, *args):
+        """Call a function and time it, in a way that works in process pools.
+
+        Returns
+        -------
+        tuple
+            The start time (seconds since the epoch), the number of seconds
+            taken, and the return value of the function.
+        """
+        start = time.time()
+        start_counter = time.perf_counter()
+        result = function(*args)
+        return start, time.perf_counter() - start_counter, result
+
+
+    @staticmethod
+    def write_indicator(indicator_id, indicator, site_dir):
+        """Write all of the Open SDG files for a single indicator.
+
+        Parameters
+        ----------
+        indicator_id : string
+            The id of the indicator.
+        indicator : Indicator
+            The (possibly translated) indicator to write.
+        site_dir : string
+            The folder to write to.
+
+        Returns
+        -------
+        tuple
+            The boolean status of the writes, and the headline as a list of
+            dicts, for use in the "all" output.
+        """
+        status = True
+        # Output all the csvs
+        status = status & write_csv(indicator_id, indicator.data, ftype='data', site_dir=site_dir)
+        status = status & write_csv(indicator_id, indicator.edges, ftype='edges', site_dir=site_dir)
+        status = status & write_csv(indicator_id, indicator.headline, ftype='headline', site_dir=site_dir)
+        # And JSON
+        data_dict = df_to_list_dict(indicator.data, orient='list')
+        edges_dict = df_to_list_dict(indicator.edges, orient='list')
+        headline_dict = df_to_list_dict(indicator.headline, orient='records')
+
+        status = status & write_json(indicator_id, data_dict, ftype='data', gz=False, site_dir=site_dir)
+        status = status & write_json(indicator_id, edges_dict, ftype='edges', gz=False, site_dir=site_dir)
+        status = status & write_json(indicator_id, headline_dict, ftype='headline', gz=False, site_dir=site_dir)
+
+        # combined
+        comb = {'data': data_dict, 'edges': edges_dict}
+        status = status & write_json(indicator_id, comb, ftype='comb', gz=False, site_dir=site_dir)
+
+        # Metadata
+        status = status & sdg.json.write_json(indicator_id, indicator.meta, ftype='meta', site_dir=site_dir)
+
+        return status, headline_dict
+
+
     def generate_sort_order(self, indicator):
         """Generate a sortable string from an indicator id.
 
@@ -182,7 +182,7 @@ class OutputSdmxMl(OutputBase):
 
         for indicator_id in self.get_indicator_ids():
             indicator = self.get_indicator_by_id(indicator_id)
-            data = indicator.data.copy()
+            data = sdg.data.categorical_to_object(indicator.data).copy()
 
             goal = indicator.get_goal_id()
             if goal not in all_serieses_by_goal:
@@ -96,7 +96,7 @@ class SchemaInputBase(Loggable):
             status = status & check_csv.check_data_types(df, inid)
             status = status & check_csv.check_leading_whitespace(df, inid)
             status = status & check_csv.check_trailing_whitespace(df, inid)
-            status = status & check_csv.check_empty_rows(df, inid)
+            status = status & check_csv.check_empty_rows(df, inid, indicator.null_patterns)
 
         return status
 
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import os
+import numpy as np
+import pandas as pd
 from sdg.translations import TranslationOutputBase
 
 class TranslationHelper(TranslationOutputBase):
@@ -32,6 +34,22 @@ class TranslationHelper(TranslationOutputBase):
                         keys[flattened] = {}
                     keys[flattened][language] = value
         self.translation_keys = keys
+        # Lookup tables of already-translated text, per language and group.
+        self.lookups = {}
+
+
+    def clear_lookups(self, language=None):
+        """Forget the lookup tables of already-translated text.
+
+        Parameters
+        ----------
+        language : string or None
+            The language code to forget. If None, all languages are forgotten.
+        """
+        if language is None:
+            self.lookups = {}
+        else:
+            self.lookups = {key: lookup for key, lookup in self.lookups.items() if key[0] != language}
 
 
     def is_translation_key(self, key):
@@ -94,3 +112,145 @@ class TranslationHelper(TranslationOutputBase):
             return text
         # If still here, return the translation.
         return self.translation_keys[key][language]
+
+
+    def translate_series(self, series, language, default_group=None, return_new_nulls=False):
+        """Translate (if possible) all of the strings in a pandas Series.
+
+        This gives the same results as calling translate() on each value, but
+        each distinct value is only translated once.
+
+        Parameters
+        ----------
+        series : Series
+            The values that may be translation keys (or may not).
+        language : string
+            The language code to translate into.
+        default_group : None or string or List
+            An optional "group" to add (if needed) to the text. See translate().
+        return_new_nulls : boolean
+            Whether to also return whether any values were translated into
+            nothing (None or NaN).
+
+        Returns
+        -------
+        Series (or tuple of Series and boolean)
+            The translated values. If nothing needs translating, this may be
+            the original Series. If return_new_nulls is True, this also returns
+            whether any non-empty values became empty.
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return self.translate_categorical(series, language, default_group, return_new_nulls)
+        translated_series, new_nulls = series, False
+        if pd.api.types.is_string_dtype(series.dtype):
+            codes, uniques = pd.factorize(series)
+            translated = self.translate_values(uniques, language, default_group)
+            # Only replace the strings that changed, because factorize treats
+            # some non-strings as equal (such as 1 and True).
+            changed = [index for index, value in enumerate(uniques)
+                       if isinstance(value, str) and translated[index] is not value]
+            new_nulls = any(self.is_empty(translated[index]) for index in changed)
+            if changed or series.dtype != object or not any(isinstance(value, str) for value in uniques):
+                values = series.to_numpy(dtype=object, copy=True)
+                if changed:
+                    # Fill an object array item by item, in case any translations are lists.
+                    lookup = np.empty(len(translated), dtype=object)
+                    for index in changed:
+                        lookup[index] = translated[index]
+                    mask = np.isin(codes, changed)
+                    values[mask] = lookup[codes[mask]]
+                # Infer the resulting types the same way that Series.apply does.
+                translated_series = pd.Series(values, index=series.index, name=series.name).infer_objects()
+            # Otherwise there is nothing to translate and nothing to infer, so
+            # the copy is skipped.
+        if return_new_nulls:
+            return translated_series, new_nulls
+        return translated_series
+
+
+    def translate_categorical(self, series, language, default_group=None, return_new_nulls=False):
+        """Translate (if possible) a Categorical pandas Series.
+
+        Only the categories are translated, and the result is also Categorical.
+
+        Parameters
+        ----------
+        series : Series
+            The Categorical values that may be translation keys (or may not).
+        language : string
+            The language code to translate into.
+        default_group : None or string or List
+            An optional "group" to add (if needed) to the text. See translate().
+        return_new_nulls : boolean
+            Whether to also return whether any values were translated into
+            nothing (None or NaN).
+
+        Returns
+        -------
+        Series (or tuple of Series and boolean)
+            The translated values. If return_new_nulls is True, this also
+            returns whether any non-empty values became empty.
+        """
+        categories = series.cat.categories
+        translated = self.translate_values(categories, language, default_group)
+        new_nulls = any(self.is_empty(value) for value in translated)
+        if all(new is old for new, old in zip(translated, categories)):
+            translated_series = series
+        elif pd.Index(translated).is_unique and not new_nulls:
+            translated_series = series.cat.rename_categories(translated)
+        else:
+            # Some categories were translated into the same text (or into nothing),
+            # so fall back to translating the values.
+            translated_series = self.translate_series(series.astype(object), language, default_group).astype('category')
+        if return_new_nulls:
+            return translated_series, new_nulls
+        return translated_series
+
+
+    @staticmethod
+    def is_empty(value):
+        """Check whether a translated value is empty (None or NaN).
+
+        Parameters
+        ----------
+        value : mixed
+            The translated value, which may be a list.
+
+        Returns
+        -------
+        boolean
+        """
+        return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+    def translate_values(self, values, language, default_group=None):
+        """Translate (if possible) a list of values, using a lookup table.
+
+        Parameters
+        ----------
+        values : list-like
+            The values that may be translation keys (or may not).
+        language : string
+            The language code to translate into.
+        default_group : None or string or List
+            An optional "group" to add (if needed) to the text. See translate().
+
+        Returns
+        -------
+        list
+            The translated values.
+        """
+        groups = tuple(default_group) if isinstance(default_group, list) else default_group
+        lookup_key = (language, groups)
+        lookup = self.lookups.get(lookup_key)
+        if lookup is None:
+            lookup = self.lookups.setdefault(lookup_key, {})
+        translated = []
+        for value in values:
+            if not isinstance(value, str):
+                translated.append(value)
+                continue
+            if value not in lookup:
+                lookup[value] = self.translate(value, language, default_group=default_group)
+            translated.append(lookup[value])
+        return translated
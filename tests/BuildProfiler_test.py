@@ -0,0 +1,38 @@
+import sdg
+import os
+import json
+
+def test_build_profiler():
+
+    profiler = sdg.BuildProfiler(top_indicators=1)
+    profiler.activate()
+    try:
+        data_pattern = os.path.join('tests', 'assets', 'open-sdg', 'data', '*.csv')
+        data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+        schema_path = os.path.join('tests', 'assets', 'open-sdg', 'metadata_schema.yml')
+        schema = sdg.schemas.SchemaInputOpenSdg(schema_path=schema_path)
+        translations = sdg.translations.TranslationInputYaml(
+            source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+        )
+        data_output = sdg.outputs.OutputOpenSdg([data_input], schema,
+            translations=[translations],
+            output_folder='_site_profile',
+            workers=2,
+        )
+        assert data_output.execute_per_language(['en'])
+    finally:
+        profiler.deactivate()
+    assert profiler not in sdg.Loggable.sinks
+
+    profile_path = os.path.join('_site_profile', 'build-profile.json')
+    profiler.write(profile_path)
+    with open(profile_path, 'r') as f:
+        profile = json.load(f)
+
+    categories = set(stage['category'] for stage in profile['stages'])
+    assert set(['input', 'merge', 'alteration', 'output', 'service']) <= categories
+    assert len(profile['slowest_indicators']) == 1
+    slowest = profile['slowest_indicators'][0]
+    assert slowest['rows'] > 0
+    assert slowest['columns'] > 0
+    assert set(slowest['tasks'].keys()) == set(['alter', 'translate', 'write_indicator'])
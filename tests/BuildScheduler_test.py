@@ -0,0 +1,38 @@
+import sdg
+import pytest
+import threading
+
+def test_build_scheduler_dependencies():
+
+    for max_workers in [1, 3]:
+        order = []
+        lock = threading.Lock()
+        def task(name):
+            def run():
+                with lock:
+                    order.append(name)
+            return run
+        scheduler = sdg.BuildScheduler(max_workers=max_workers)
+        scheduler.add_task('first', task('first'))
+        scheduler.add_task('second', task('second'))
+        scheduler.add_task('last', task('last'), depends_on=['first', 'second'])
+        assert scheduler.run()
+        assert order[-1] == 'last'
+        assert sorted(order) == ['first', 'last', 'second']
+        assert sorted(scheduler.get_timings().keys()) == ['first', 'last', 'second']
+
+
+def test_build_scheduler_failures():
+
+    ran = []
+    scheduler = sdg.BuildScheduler(max_workers=2)
+    scheduler.add_task('fails', lambda: False)
+    scheduler.add_task('after', lambda: ran.append('after'), depends_on=['fails'])
+    assert scheduler.run() == False
+    # Dependent tasks still run after a failure.
+    assert ran == ['after']
+
+    with pytest.raises(KeyError):
+        scheduler.add_task('fails', lambda: True)
+    with pytest.raises(KeyError):
+        scheduler.add_task('other', lambda: True, depends_on=['missing'])
@@ -0,0 +1,277 @@
+import sdg
+import warnings
+import pickle
+import os
+import numpy as np
+import pandas as pd
+from frictionless import Schema
+
+def test_indicator_headline_and_edges_are_cached(monkeypatch):
+
+    calls = {'headline': 0, 'edges': 0}
+    filter_headline = sdg.data.filter_headline
+    edge_detection = sdg.edges.edge_detection
+    def count_headline(*args):
+        calls['headline'] += 1
+        return filter_headline(*args)
+    def count_edges(*args):
+        calls['edges'] += 1
+        return edge_detection(*args)
+    monkeypatch.setattr(sdg.data, 'filter_headline', count_headline)
+    monkeypatch.setattr(sdg.edges, 'edge_detection', count_edges)
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2020],
+        'SEX': [None, 'F', 'F'],
+        'AGE': [None, None, 'Y0T14'],
+        'Value': [10, 5, 1],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data.iloc[:1])
+    indicator.set_data(data.iloc[1:2])
+    indicator.set_data(data.iloc[2:])
+    # Nothing is calculated until it is needed.
+    assert calls == {'headline': 0, 'edges': 0}
+
+    assert indicator.has_headline()
+    assert indicator.has_edges()
+    assert len(indicator.headline) == 1
+    assert indicator.edges.values.tolist() == [['SEX', 'AGE']]
+    assert calls == {'headline': 1, 'edges': 1}
+
+    # Changing the data invalidates them.
+    indicator.set_data(pd.DataFrame({'Year': [2021], 'Value': [12]}))
+    assert len(indicator.headline) == 2
+    assert calls == {'headline': 2, 'edges': 1}
+
+def test_indicator_translation_shares_unchanged_data_and_meta():
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    data = pd.DataFrame({
+        'Year': [2020, 2021, 2021],
+        'COLUMN': [None, 'foo.foo', 'baz'],
+        'Value': [10.0, 5.0, 1.0],
+    })
+    meta = {
+        'indicator_name': 'foo.foo',
+        'graph_title': 'Untranslated',
+        'sources': [{'source_organisation_1': 'Untranslated'}],
+        'tags': ['foo.foo', 'baz'],
+    }
+    indicator = sdg.Indicator('1-1-1', data=data, meta=meta)
+    indicator.translate('en', translation_helper)
+    translated = indicator.language('en')
+
+    assert translated.data['COLUMN'].tolist() == [None, 'bar', 'baz']
+    assert indicator.data['COLUMN'].tolist() == [None, 'foo.foo', 'baz']
+    assert np.shares_memory(translated.data['Value'].values, indicator.data['Value'].values)
+    assert not np.shares_memory(translated.data['COLUMN'].values, indicator.data['COLUMN'].values)
+
+    assert translated.meta['indicator_name'] == 'bar'
+    assert translated.meta['tags'] == ['bar', 'baz']
+    assert meta['tags'] == ['foo.foo', 'baz']
+    assert translated.meta['sources'] == meta['sources']
+
+    # Changing the translation does not change the source indicator.
+    translated.meta['sources'][0]['source_organisation_1'] = 'Changed'
+    translated.meta['tags'].append('new')
+    assert meta['sources'] == [{'source_organisation_1': 'Untranslated'}]
+    assert meta['tags'] == ['foo.foo', 'baz']
+    translated.data['Value'] = translated.data['Value'] * 2
+    assert indicator.data['Value'].tolist() == [10.0, 5.0, 1.0]
+
+def test_indicator_get_all_series():
+
+    data = pd.DataFrame({
+        'Year': [2020, 2021, 2021, 2021, 2020, 2020],
+        'SEX': [None, 'F', np.nan, 'F', 'M', None],
+        'COMMENT_OBS': ['a', None, 'b', 'c', 'd', 'e'],
+        'Value': [1.0, np.nan, 3.0, 4.0, 5.0, 6.0],
+    })
+    options = sdg.IndicatorOptions()
+    options.add_observation_attribute('COMMENT_OBS')
+    indicator = sdg.Indicator('1-1-1', data=data, options=options)
+
+    serieses = indicator.get_all_series()
+    assert [series.get_disaggregations() for series in serieses] == [{'SEX': ''}, {'SEX': 'F'}, {'SEX': 'M'}]
+    assert list(indicator.iter_series_disaggregations()) == [{'SEX': ''}, {'SEX': 'F'}, {'SEX': 'M'}]
+    # Duplicate years keep the first value, NaN is replaced with ''.
+    assert [series.get_values() for series in serieses] == [{2020: 1.0, 2021: 3.0}, {2021: ''}, {2020: 5.0}]
+    assert all(type(year) is int for series in serieses for year in series.get_values())
+    assert serieses[0].get_observation_attributes() == {2020: {'COMMENT_OBS': 'e'}, 2021: {'COMMENT_OBS': 'b'}}
+    assert indicator.get_all_series() is serieses
+
+def test_indicator_get_data_matching_schema():
+
+    class DataSchema:
+        def __init__(self, schema):
+            self.schema = schema
+        def get_schema_for_indicator(self, indicator):
+            return self.schema
+
+    data_schema = DataSchema(Schema({'fields': [
+        {'name': 'Year', 'type': 'integer'},
+        {'name': 'SEX', 'type': 'string', 'constraints': {'enum': ['F', 'M']}},
+        {'name': 'AGE', 'type': 'integer', 'constraints': {'enum': [15, 65]}},
+        {'name': 'Value', 'type': 'number'},
+    ]}))
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2020, 2020, 2020, 2020],
+        'SEX': ['F', None, 'X', 'M', 'F', 'F'],
+        'AGE': [15.0, 65.0, np.nan, np.nan, 30.0, 15.0],
+        'UNITS': [None, None, None, None, None, 'percent'],
+        'Value': [1, 2, 3, 4, 5, 6],
+    }, index=[0, 1, 2, 0, 1, 2])
+    indicator = sdg.Indicator('1-1-1', data=data)
+
+    # This runs in every build, so it should not log any FutureWarnings.
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        matching = indicator.get_data_matching_schema(data_schema)
+    assert matching['Value'].tolist() == [1, 2, 4]
+    assert indicator.get_data_matching_schema(data_schema) is matching
+    assert indicator.get_data_matching_schema(data_schema, use_cache=False) is not matching
+
+def test_indicator_categorical_columns():
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2021],
+        'SEX': [None, 'F', 'M'],
+        'Value': [1.0, 2.0, 3.0],
+    })
+    options = sdg.IndicatorOptions().set_categorical_columns(True)
+    indicator = sdg.Indicator('1-1-1', data=data, options=options)
+    indicator.set_data(pd.DataFrame({'Year': [2022], 'SEX': ['X'], 'Value': [4.0]}))
+    assert isinstance(indicator.data['SEX'].dtype, pd.CategoricalDtype)
+    assert indicator.data['SEX'].astype(object).tolist() == [np.nan, 'F', 'M', 'X']
+    assert indicator.data['Year'].dtype == np.int64
+    assert len(indicator.headline) == 1
+    assert list(indicator.iter_series_disaggregations()) == [{'SEX': ''}, {'SEX': 'F'}, {'SEX': 'M'}, {'SEX': 'X'}]
+
+    # By default the text columns are left alone.
+    indicator = sdg.Indicator('1-1-1', data=data)
+    assert indicator.data['SEX'].dtype == object
+
+def test_indicator_add_data():
+
+    data = pd.DataFrame({'Year': [2020], 'Value': [1.0]})
+    pieces = [
+        pd.DataFrame({'Value': [2.0], 'SEX': ['F'], 'Year': [2021]}),
+        None,
+        pd.DataFrame(),
+        pd.DataFrame({'Year': [2022], 'AGE': ['Y0T14'], 'Value': [3.0]}),
+    ]
+    indicator = sdg.Indicator('1-1-1', data=data)
+    indicator.add_data(pieces)
+    one_by_one = sdg.Indicator('1-1-1', data=data)
+    for piece in pieces:
+        one_by_one.set_data(piece)
+
+    assert indicator.data.columns.tolist() == ['Year', 'SEX', 'AGE', 'Value']
+    pd.testing.assert_frame_equal(indicator.data, one_by_one.data)
+
+def test_indicator_get_fingerprint():
+
+    data = pd.DataFrame({'Year': [2020, 2021], 'SEX': ['F', None], 'Value': [1.0, 2.0]})
+    meta = {'indicator_name': 'Foo', 'tags': ['a', 'b']}
+    indicator = sdg.Indicator('1-1-1', data=data, meta=dict(meta))
+    same = sdg.Indicator('1-1-1', data=data.copy(), meta=dict(meta))
+    fingerprint = indicator.get_fingerprint()
+    assert fingerprint == same.get_fingerprint()
+    assert indicator.get_fingerprint() is fingerprint
+
+    indicator.set_meta({'tags': ['c']})
+    assert indicator.get_fingerprint() != fingerprint
+    fingerprint = indicator.get_fingerprint()
+    indicator.set_data(pd.DataFrame({'Year': [2022], 'Value': [3.0]}))
+    assert indicator.get_fingerprint() != fingerprint
+    fingerprint = indicator.get_fingerprint()
+    indicator.set_name('Bar')
+    assert indicator.get_fingerprint() != fingerprint
+    fingerprint = indicator.get_fingerprint()
+    indicator.meta['tags'].append('d')
+    assert indicator.get_fingerprint() == fingerprint
+    indicator.clear_fingerprint()
+    assert indicator.get_fingerprint() != fingerprint
+
+    assert sdg.Indicator('1-1-2', data=data, meta=dict(meta)).get_fingerprint() != same.get_fingerprint()
+
+def test_indicator_translation_reuses_edges(monkeypatch):
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    calls = []
+    edge_detection = sdg.edges.edge_detection
+    def count_edges(*args):
+        calls.append(args)
+        return edge_detection(*args)
+    monkeypatch.setattr(sdg.edges, 'edge_detection', count_edges)
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2020],
+        'foo': [None, 'foo', 'foo'],
+        'AGE': [None, None, 'Y0T14'],
+        'Value': [10, 5, 1],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data)
+    indicator.translate('en', translation_helper)
+    translated = indicator.language('en')
+
+    assert indicator.edges.values.tolist() == [['foo', 'AGE']]
+    assert translated.edges.values.tolist() == [['bar', 'AGE']]
+    assert len(calls) == 1
+    assert translated.headline.values.tolist() == [[2020, 10]]
+
+def test_indicator_translation_into_nothing_detects_edges(tmp_path):
+
+    # A translation with no value turns "c" into None.
+    os.makedirs(os.path.join(tmp_path, 'en'))
+    with open(os.path.join(tmp_path, 'en', 'data.yml'), 'w') as f:
+        f.write('c:\n')
+    translation_input = sdg.translations.TranslationInputYaml(source=str(tmp_path))
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2020],
+        'SEX': [None, 'c', 'F'],
+        'AGE': [None, 'Y0T14', None],
+        'Value': [10, 5, 1],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data)
+    assert indicator.edges.values.tolist() == [['SEX', 'AGE']]
+    indicator.translate('en', translation_helper)
+    translated = indicator.language('en')
+
+    # Now AGE can be present without SEX, so SEX is no longer its parent.
+    assert translated.data['SEX'].tolist() == [None, None, 'F']
+    assert translated.edges.empty
+
+def test_indicator_pickle_leaves_out_translations():
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+    data = pd.DataFrame({
+        'Year': [2020, 2021],
+        'COLUMN': [None, 'foo.foo'],
+        'Value': [10.0, 5.0],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data, meta={'indicator_name': 'foo.foo'})
+    indicator.translate('en', translation_helper)
+    headline = indicator.headline
+
+    unpickled = pickle.loads(pickle.dumps(indicator))
+    assert unpickled.translations == {}
+    assert unpickled.meta == indicator.meta
+    pd.testing.assert_frame_equal(unpickled.data, indicator.data)
+    pd.testing.assert_frame_equal(unpickled.headline, headline)
+    pd.testing.assert_frame_equal(unpickled.edges, indicator.edges)
+    # The original indicator is unaffected.
+    assert 'en' in indicator.translations
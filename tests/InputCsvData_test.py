@@ -1,6 +1,7 @@
 import sdg
 import os
 import inputs_common
+import pandas as pd
 
 def test_csv_input():
 
@@ -70,3 +71,29 @@ def test_csv_input_with_code_map():
     indicator.translate('en', translation_helper)
 
     inputs_common.assert_input_has_correct_data(indicator.language('en').data, correct_data)
+
+def test_csv_input_lazy():
+
+    data_pattern = os.path.join('tests', 'assets', 'open-sdg', 'data', '*.csv')
+    eager_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+    eager_input.execute(indicator_options=sdg.IndicatorOptions())
+    data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern, lazy=True, max_resident=1)
+    data_input.execute(indicator_options=sdg.IndicatorOptions())
+
+    # Nothing is read until it is needed.
+    assert len(data_input.data_pool) == 0
+    for indicator_id in eager_input.indicators:
+        eager = eager_input.indicators[indicator_id]
+        lazy = data_input.indicators[indicator_id]
+        assert lazy.is_lazy()
+        pd.testing.assert_frame_equal(lazy.data, eager.data)
+        pd.testing.assert_frame_equal(lazy.headline, eager.headline)
+        pd.testing.assert_frame_equal(lazy.edges, eager.edges)
+        # Only one DataFrame is kept in memory at a time.
+        assert len(data_input.data_pool) == 1
+
+    # Setting the data replaces the lazy loading.
+    indicator = data_input.indicators['1-1-1']
+    indicator.set_data(eager_input.indicators['1-1-1'].data)
+    assert not indicator.is_lazy()
+    assert len(indicator.data) == 2 * len(eager_input.indicators['1-1-1'].data)
@@ -0,0 +1,47 @@
+import sdg
+import os
+import json
+
+class SpanExample(sdg.Loggable):
+
+    @sdg.Loggable.spanned(category='example')
+    def outer(self):
+        with self.span('inner', foo='bar'):
+            self.log('Inside {class_name}')
+
+def test_loggable_spans(capsys):
+
+    # Without any sinks wanting spans, nothing is timed.
+    example = SpanExample()
+    example.outer()
+    assert 'Inside SpanExample' in capsys.readouterr().out
+
+    log_path = os.path.join('_site_log', 'log.jsonl')
+    sink = sdg.logs.LogJsonLinesSink(log_path)
+    sdg.Loggable.add_sink(sink)
+    try:
+        example.outer()
+    finally:
+        sdg.Loggable.remove_sink(sink)
+        sink.close()
+    assert sink not in sdg.Loggable.sinks
+    assert sdg.Loggable.span_sinks == ()
+
+    # The print format is unchanged.
+    output = capsys.readouterr().out
+    assert output.endswith(' - Inside SpanExample\n')
+    assert output[2] == ':' and output[5] == ':'
+
+    with open(log_path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record['type'] for record in records] == ['message', 'span', 'span']
+    message, inner, outer = records
+    assert message['message'] == 'Inside SpanExample'
+    assert outer['name'] == 'outer'
+    assert outer['category'] == 'example'
+    assert outer['depth'] == 0 and outer['parent'] is None
+    assert inner['name'] == 'inner'
+    assert inner['foo'] == 'bar'
+    assert inner['depth'] == 1 and inner['parent'] == outer['id']
+    assert outer['start'] <= inner['start'] <= inner['end'] <= outer['end']
+    assert 0 <= inner['duration_ms'] <= outer['duration_ms']
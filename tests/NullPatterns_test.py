@@ -0,0 +1,97 @@
+import sdg
+import os
+import numpy as np
+import pandas as pd
+
+def test_null_patterns():
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2021, 2021, 2021],
+        'SEX': [None, 'F', None, 'M', 'F'],
+        'AGE': [None, None, None, 'Y0T14', np.nan],
+        'Value': [1.0, 2.0, 3.0, 4.0, np.nan],
+    })
+    patterns = sdg.NullPatterns.from_dataframe(data)
+    assert patterns.columns == ['Year', 'SEX', 'AGE', 'Value']
+    assert len(patterns.patterns) == 4
+    assert patterns.counts.sum() == 5
+    assert patterns.patterns[patterns.row_patterns].tolist() == data.notnull().values.tolist()
+
+    disaggregations = patterns.select(['SEX', 'AGE'])
+    assert disaggregations.patterns.tolist() == [[False, False], [True, False], [True, True]]
+    assert disaggregations.counts.tolist() == [2, 2, 1]
+    assert disaggregations.get_empty_rows().tolist() == [True, False, True, False, False]
+    assert patterns.rename({'SEX': 'Sex'}).columns == ['Year', 'Sex', 'AGE', 'Value']
+
+    empty = sdg.NullPatterns.from_dataframe(data[[]])
+    assert len(empty.patterns) == 1
+    assert empty.get_empty_rows().tolist() == [True] * 5
+
+def test_null_patterns_shared_by_translations():
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2021],
+        'foo': [None, 'foo', 'baz'],
+        'Value': [1.0, 2.0, 3.0],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data)
+    indicator.translate('en', translation_helper)
+    translated = indicator.language('en')
+
+    assert translated.data.columns.tolist() == ['Year', 'bar', 'Value']
+    assert translated.null_patterns.columns == ['Year', 'bar', 'Value']
+    assert translated.null_patterns.patterns is indicator.null_patterns.patterns
+    assert len(translated.headline) == 1
+
+def test_null_patterns_calculated_once(monkeypatch):
+
+    calls = []
+    from_dataframe = sdg.NullPatterns.from_dataframe
+    def count_from_dataframe(*args, **kwargs):
+        calls.append(args)
+        return from_dataframe(*args, **kwargs)
+    monkeypatch.setattr(sdg.NullPatterns, 'from_dataframe', count_from_dataframe)
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, None],
+        'SEX': [None, 'F', None],
+        'Value': [1.0, 2.0, None],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data)
+    assert len(indicator.headline) == 2
+    assert indicator.edges.empty
+    assert not sdg.check_csv.check_empty_rows(indicator.data, '1-1-1', indicator.null_patterns)
+    assert len(calls) == 1
+
+    indicator.data = data.iloc[:2]
+    assert sdg.check_csv.check_empty_rows(indicator.data, '1-1-1', indicator.null_patterns)
+    assert len(calls) == 2
+
+def test_null_patterns_after_translating_into_nothing(tmp_path):
+
+    # A translation with no value turns "c" into None.
+    os.makedirs(os.path.join(tmp_path, 'en'))
+    with open(os.path.join(tmp_path, 'en', 'data.yml'), 'w') as f:
+        f.write('c:\n')
+    translation_input = sdg.translations.TranslationInputYaml(source=str(tmp_path))
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    data = pd.DataFrame({
+        'Year': [2020, 2020, 2020],
+        'COLUMN': [None, 'c', 'd'],
+        'Value': [1.0, 2.0, 3.0],
+    })
+    indicator = sdg.Indicator('1-1-1', data=data)
+    indicator.null_patterns
+    indicator.translate('en', translation_helper)
+    translated = indicator.language('en')
+
+    assert translated.data['COLUMN'].tolist() == [None, None, 'd']
+    assert translated.null_patterns.patterns is not indicator.null_patterns.patterns
+    assert translated.null_patterns.select(['COLUMN']).get_empty_rows().tolist() == [True, True, False]
+    assert translated.headline['Value'].tolist() == [1.0, 2.0]
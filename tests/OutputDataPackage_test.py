@@ -53,3 +53,29 @@ def test_datapackage_output_data():
     output_df = pd.read_csv(output_path)
     correct_df = pd.read_csv(correct_path)
     pd.testing.assert_frame_equal(correct_df, output_df)
+
+def test_datapackage_output_concurrent_languages():
+
+    def build(output_folder, workers):
+        data_pattern = os.path.join('tests', 'assets', 'data', 'csv', '*.csv')
+        data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+        schema_path = os.path.join('tests', 'assets', 'meta', 'metadata_schema.yml')
+        schema = sdg.schemas.SchemaInputOpenSdg(schema_path=schema_path)
+        translations = sdg.translations.TranslationInputYaml(
+            source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+        )
+        data_output = sdg.outputs.OutputDataPackage([data_input], schema,
+            translations=[translations], output_folder=output_folder,
+            sorting='alphabetical')
+        assert data_output.execute_per_language(['en', 'es', 'fr'], workers=workers)
+        # The output folder should be unchanged after the builds.
+        assert data_output.output_folder == output_folder
+
+    build('_site_datapackage_serial', 1)
+    build('_site_datapackage_concurrent', 3)
+    for language in ['en', 'es', 'fr']:
+        for path in [['all.json'], ['1-1-1', 'datapackage.json'], ['1-1-1', 'data.csv']]:
+            with open(os.path.join('_site_datapackage_serial', language, 'data-packages', *path)) as f:
+                expected = f.read()
+            with open(os.path.join('_site_datapackage_concurrent', language, 'data-packages', *path)) as f:
+                assert f.read() == expected
@@ -228,3 +228,138 @@ def test_open_sdg_output_zip():
         assert data['filename'] == 'all_indicators.zip'
     zip_path = os.path.join(english_build, 'zip', 'all_indicators.zip')
     assert os.path.isfile(zip_path)
+
+def test_open_sdg_output_parallel():
+
+    def build(output_folder, workers, worker_type='thread'):
+        data_pattern = os.path.join('tests', 'assets', 'open-sdg', 'data', '*.csv')
+        data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+        schema_path = os.path.join('tests', 'assets', 'open-sdg', 'metadata_schema.yml')
+        schema = sdg.schemas.SchemaInputOpenSdg(schema_path=schema_path)
+        translations = sdg.translations.TranslationInputYaml(
+            source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+        )
+        data_output = sdg.outputs.OutputOpenSdg([data_input], schema,
+            translations=[translations],
+            output_folder=output_folder,
+            workers=workers,
+            worker_type=worker_type,
+        )
+        assert data_output.execute_per_language(['en'])
+        with open(os.path.join(output_folder, 'en', 'headline', 'all.json'), 'r') as f:
+            return f.read()
+
+    serial = build('_site_open_sdg_serial', 1)
+    assert build('_site_open_sdg_threads', 2) == serial
+    assert build('_site_open_sdg_processes', 2, 'process') == serial
+    for indicator_id in ['1-1-1', '1-2-1']:
+        for ftype in ['data', 'edges', 'headline', 'comb', 'meta']:
+            with open(os.path.join('_site_open_sdg_serial', 'en', ftype, indicator_id + '.json')) as f:
+                expected = f.read()
+            with open(os.path.join('_site_open_sdg_threads', 'en', ftype, indicator_id + '.json')) as f:
+                assert f.read() == expected
+
+def test_open_sdg_output_incremental():
+
+    def build(alter_data=None, data_pattern=None):
+        if data_pattern is None:
+            data_pattern = os.path.join('tests', 'assets', 'open-sdg', 'data', '*.csv')
+        data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+        if alter_data is not None:
+            data_input.add_data_alteration(alter_data)
+        schema_path = os.path.join('tests', 'assets', 'open-sdg', 'metadata_schema.yml')
+        schema = sdg.schemas.SchemaInputOpenSdg(schema_path=schema_path)
+        translations = sdg.translations.TranslationInputYaml(
+            source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+        )
+        data_output = sdg.outputs.OutputOpenSdg([data_input], schema,
+            translations=[translations],
+            output_folder='_site_open_sdg_incremental',
+            incremental=True,
+        )
+        assert data_output.execute_per_language(['en'])
+        return data_output
+
+    def read(ftype, indicator_id):
+        with open(os.path.join('_site_open_sdg_incremental', 'en', ftype, indicator_id + '.json')) as f:
+            return f.read()
+
+    def write(ftype, indicator_id, content):
+        with open(os.path.join('_site_open_sdg_incremental', 'en', ftype, indicator_id + '.json'), 'w') as f:
+            f.write(content)
+
+    build()
+    assert os.path.isfile(os.path.join('_site_open_sdg_incremental', 'en', 'build-manifest.json'))
+    # Mark some files, to detect whether they get rewritten.
+    write('meta', '1-2-1', 'unchanged')
+    write('headline', 'all', 'unchanged')
+    data_output = build()
+    assert read('meta', '1-2-1') == 'unchanged'
+    assert read('headline', 'all') == 'unchanged'
+    # Nothing changed, so nothing needed translating.
+    for indicator in data_output.indicators.values():
+        assert 'en' not in indicator.translations
+
+    # Missing aggregate files are written again.
+    os.remove(os.path.join('_site_open_sdg_incremental', 'en', 'stats', 'reporting.json'))
+    build()
+    assert os.path.isfile(os.path.join('_site_open_sdg_incremental', 'en', 'stats', 'reporting.json'))
+    assert read('meta', '1-2-1') == 'unchanged'
+    assert read('headline', 'all') != 'unchanged'
+
+    # Changing one indicator rewrites it, along with the aggregate files.
+    def alter_data(df, context):
+        if context['indicator_id'] == '1-1-1':
+            df['Value'] = df['Value'] * 2
+        return df
+    build(alter_data)
+    assert read('meta', '1-2-1') == 'unchanged'
+    assert json.loads(read('data', '1-1-1'))['Value'][0] == 200
+    assert json.loads(read('headline', 'all'))['1-1-1'][0]['Value'] == 200
+
+    # Removing an indicator from the inputs removes it from the site too.
+    build(alter_data, data_pattern=os.path.join('tests', 'assets', 'open-sdg', 'data', '*1-1-1.csv'))
+    for ftype in ['data', 'edges', 'headline', 'comb', 'meta']:
+        assert not os.path.exists(os.path.join('_site_open_sdg_incremental', 'en', ftype, '1-2-1.json'))
+    assert '1-2-1' not in json.loads(read('meta', 'all'))
+    with open(os.path.join('_site_open_sdg_incremental', 'en', 'build-manifest.json')) as f:
+        assert list(json.load(f)['indicators']) == ['1-1-1']
+
+def test_open_sdg_output_cache():
+
+    cache_dir = os.path.join('_site_open_sdg_cache', 'cache')
+
+    def prepare(alter_data=None):
+        data_pattern = os.path.join('tests', 'assets', 'open-sdg', 'data', '*.csv')
+        data_input = sdg.inputs.InputCsvData(path_pattern=data_pattern)
+        if alter_data is not None:
+            data_input.add_data_alteration(alter_data)
+        schema_path = os.path.join('tests', 'assets', 'open-sdg', 'metadata_schema.yml')
+        schema = sdg.schemas.SchemaInputOpenSdg(schema_path=schema_path)
+        data_output = sdg.outputs.OutputOpenSdg([data_input], schema,
+            output_folder='_site_open_sdg_cache',
+            cache_dir=cache_dir,
+        )
+        return data_input, data_output
+
+    first_input, first_output = prepare()
+    assert len(first_input.indicators) > 0
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A second output with new inputs should not need to execute them.
+    second_input, second_output = prepare()
+    assert len(second_input.indicators) == 0
+    for indicator_id in first_output.indicators:
+        pd.testing.assert_frame_equal(
+            first_output.indicators[indicator_id].data,
+            second_output.indicators[indicator_id].data,
+        )
+
+    # Changing an alteration replaces the stale cache file.
+    def alter_data(df):
+        df['Value'] = df['Value'] * 2
+        return df
+    third_input, third_output = prepare(alter_data)
+    assert len(third_input.indicators) > 0
+    assert len(os.listdir(cache_dir)) == 1
+    assert third_output.indicators['1-1-1'].data['Value'].iloc[0] == 200
@@ -0,0 +1,35 @@
+import sdg
+
+def test_series_from_arrays():
+
+    years = [2020, 2021, 2020]
+    values = [1, 2, 3]
+    comments = ['a', 'b', 'c']
+
+    series = sdg.Series({'SEX': 'F'}, '1-1-1')
+    for year, value in zip(years, values):
+        series.add_value(year, value)
+    for year, value in zip(years, comments):
+        series.add_observation_attribute(year, 'COMMENT_OBS', value)
+
+    bulk = sdg.Series.from_arrays({'SEX': 'F'}, years, values, {'COMMENT_OBS': comments}, indicator_id='1-1-1')
+    assert bulk.get_disaggregations() == {'SEX': 'F'}
+    assert bulk.get_values() == series.get_values() == {2020: 1, 2021: 2}
+    assert bulk.get_observation_attributes() == series.get_observation_attributes()
+    assert bulk.get_observation_attributes() == {2020: {'COMMENT_OBS': 'c'}, 2021: {'COMMENT_OBS': 'b'}}
+    assert bulk.get_disaggregation('SEX') == 'F'
+    assert bulk.get_disaggregation('AGE') is None
+    assert not hasattr(bulk, '__dict__')
+
+def test_series_add_value_duplicates():
+
+    series = sdg.Series({'SEX': 'F'}, '1-1-1')
+    for year in range(2000, 2010):
+        series.add_value(year, year - 2000)
+    assert series.get_values() is series.get_values()
+    # Duplicate years keep the first value, including after the values are read.
+    series.add_value(2005, 100)
+    series.add_value(2010, 10)
+    assert series.get_values()[2005] == 5
+    assert series.get_values()[2010] == 10
+    assert len(series.get_values()) == 11
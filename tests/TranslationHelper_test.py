@@ -0,0 +1,54 @@
+import sdg
+import os
+import numpy as np
+import pandas as pd
+
+def test_translation_helper_translate_series():
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    columns = {
+        'strings': ['foo', None, 'foo', 'baz', np.nan, 'foo.foo'],
+        'mixed': [1, True, 'foo', 1.0, None, 'foo'],
+        'numbers': [1, 2, 3, 4, 5, 6],
+        'floats': [1.5, np.nan, 2.5, 3.5, 4.5, 5.5],
+        'empty': [None] * 6,
+    }
+    for name in columns:
+        series = pd.Series(columns[name], name=name, index=range(10, 16))
+        expected = series.apply(lambda x: translation_helper.translate(x, 'en', default_group=['foo', 'data']))
+        actual = translation_helper.translate_series(series, 'en', default_group=['foo', 'data'])
+        pd.testing.assert_series_equal(actual, expected)
+        assert actual.map(type).tolist() == expected.map(type).tolist()
+
+    series = pd.Series(['foo', 'foo', 'baz'])
+    assert translation_helper.translate_series(series, 'en', default_group='foo').tolist() == ['bar', 'bar', 'baz']
+    assert translation_helper.lookups[('en', 'foo')] == {'foo': 'bar', 'baz': 'baz'}
+
+    # The lookups can be forgotten one language at a time.
+    translation_helper.translate_series(series, 'es', default_group='foo')
+    translation_helper.clear_lookups('en')
+    assert list(translation_helper.lookups) == [('es', 'foo')]
+    translation_helper.clear_lookups()
+    assert translation_helper.lookups == {}
+
+def test_translation_helper_translate_categorical():
+
+    translation_input = sdg.translations.TranslationInputYaml(
+        source=os.path.join('tests', 'assets', 'translations', 'yaml'),
+    )
+    translation_helper = sdg.translations.TranslationHelper([translation_input])
+
+    series = pd.Series(['foo', None, 'baz', 'foo'], dtype='category')
+    translated = translation_helper.translate_series(series, 'en', default_group='foo')
+    assert isinstance(translated.dtype, pd.CategoricalDtype)
+    assert translated.astype(object).tolist() == ['bar', np.nan, 'baz', 'bar']
+
+    # When two categories translate to the same text, they are merged.
+    series = pd.Series(['foo', 'bar', 'baz'], dtype='category')
+    translated = translation_helper.translate_series(series, 'en', default_group='foo')
+    assert translated.astype(object).tolist() == ['bar', 'bar', 'baz']
+    assert translated.cat.categories.tolist() == ['bar', 'baz']
@@ -0,0 +1,177 @@
+"""End-to-end benchmark of open_sdg_check and open_sdg_build.
+
+A synthetic corpus is generated (see benchmark_corpus.py) and then checked and
+built, recording the time spent in each phase. For example, from the root of
+this repository:
+
+    python tests/benchmark.py --size national --languages en es fr
+    python tests/benchmark.py --indicators 50 --disaggregations 2 --json results.json
+
+A smoke test of the benchmark is in benchmark_test.py, which is not run by
+default. To run it:
+
+    SDG_BENCHMARK=1 python -m pytest tests/benchmark_test.py
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sdg
+from benchmark_corpus import generate_corpus
+
+# Preset corpus sizes, from a quick smoke test to a national reporting platform.
+SIZES = {
+    'toy': {'indicators': 3, 'disaggregations': 1, 'values': 2, 'years': 2, 'geocodes': 2},
+    'small': {'indicators': 25, 'disaggregations': 2, 'values': 3, 'years': 5, 'geocodes': 10},
+    'medium': {'indicators': 100, 'disaggregations': 3, 'values': 3, 'years': 10, 'geocodes': 20},
+    'national': {'indicators': 250, 'disaggregations': 4, 'values': 4, 'years': 15, 'geocodes': 50},
+}
+
+
+def summarize_profile(report):
+    """Total up the profiled stages of a build.
+
+    Parameters
+    ----------
+    report : dict
+        A report from BuildProfiler.get_report().
+
+    Returns
+    -------
+    dict
+        Seconds spent per category of stage, and per output.
+    """
+    categories = {}
+    outputs = {}
+    for stage in report['stages']:
+        category = stage['category'] or 'other'
+        categories[category] = categories.get(category, 0) + stage['seconds']
+        if category == 'output':
+            # Stage names are like "Output: OutputOpenSdg (en)".
+            output = stage['name'].split(': ', 1)[-1].split(' (')[0]
+            outputs[output] = outputs.get(output, 0) + stage['seconds']
+    return {
+        'categories': {key: round(value, 3) for key, value in categories.items()},
+        'outputs': {key: round(value, 3) for key, value in outputs.items()},
+        'peak_rss_kb': report['peak_rss_kb'],
+        'slowest_indicators': report['slowest_indicators'],
+    }
+
+
+def run_benchmark(folder, corpus=None, build=None, check=True):
+    """Generate a corpus, then check and build it, timing each phase.
+
+    Parameters
+    ----------
+    folder : string
+        The folder to generate the corpus and build the site in.
+    corpus : dict or None
+        Keyword arguments for generate_corpus().
+    build : dict or None
+        Extra keyword arguments for open_sdg_build(), such as "workers".
+    check : boolean
+        Whether to also time open_sdg_check().
+
+    Returns
+    -------
+    dict
+        The benchmark results, suitable for JSON.
+    """
+    corpus = {} if corpus is None else corpus
+    build = {} if build is None else build
+    results = {'corpus': dict(corpus), 'build_options': dict(build), 'phases': {}}
+
+    start = time.perf_counter()
+    results['corpus_stats'] = generate_corpus(folder, **corpus)
+    results['phases']['generate'] = round(time.perf_counter() - start, 3)
+
+    # Paths in the generated config are relative to the corpus folder.
+    cwd = os.getcwd()
+    os.chdir(folder)
+    try:
+        if check:
+            start = time.perf_counter()
+            results['check_status'] = sdg.open_sdg_check(config='config.yml')
+            results['phases']['check'] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        results['build_status'] = sdg.open_sdg_build(config='config.yml',
+            profile_path='profile.json', **build)
+        results['phases']['build'] = round(time.perf_counter() - start, 3)
+
+        with open('profile.json', encoding='utf-8') as f:
+            results['profile'] = summarize_profile(json.load(f))
+    finally:
+        os.chdir(cwd)
+
+    return results
+
+
+def print_results(results):
+    stats = results['corpus_stats']
+    print('Corpus: {} indicators, {} rows, {} cells'.format(stats['indicators'], stats['rows'], stats['cells']))
+    for phase, seconds in results['phases'].items():
+        print('  {:<40} {:>10.3f}s'.format(phase, seconds))
+    print('Build stages by category (summed across threads):')
+    for category, seconds in results['profile']['categories'].items():
+        print('  {:<40} {:>10.3f}s'.format(category, seconds))
+    print('Build stages by output:')
+    for output, seconds in results['profile']['outputs'].items():
+        print('  {:<40} {:>10.3f}s'.format(output, seconds))
+    print('Peak memory: {} KB'.format(results['profile']['peak_rss_kb']))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmark Open SDG builds on a synthetic corpus.')
+    parser.add_argument('--size', choices=sorted(SIZES.keys()), default='small',
+        help='Preset corpus size. Any of the options below override the preset.')
+    parser.add_argument('--indicators', type=int)
+    parser.add_argument('--disaggregations', type=int, help='Disaggregation columns per indicator.')
+    parser.add_argument('--values', type=int, help='Values per disaggregation column.')
+    parser.add_argument('--years', type=int)
+    parser.add_argument('--geocodes', type=int, help='Number of regions, for map layers.')
+    parser.add_argument('--sparsity', type=float, default=0.2)
+    parser.add_argument('--languages', nargs='+', default=['en'])
+    parser.add_argument('--sdmx-dsd', help='Path or URL to a DSD, to also benchmark SDMX output.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--folder', default='_benchmark')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--worker-type', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--language-workers', type=int, default=1)
+    parser.add_argument('--output-workers', type=int, default=1)
+    parser.add_argument('--no-check', action='store_true', help='Skip timing open_sdg_check.')
+    parser.add_argument('--json', help='Path to a JSON file in which to write the results.')
+    args = parser.parse_args(args)
+
+    corpus = dict(SIZES[args.size])
+    for key in ['indicators', 'disaggregations', 'values', 'years', 'geocodes']:
+        if getattr(args, key) is not None:
+            corpus[key] = getattr(args, key)
+    corpus.update({
+        'sparsity': args.sparsity,
+        'languages': args.languages,
+        'sdmx_dsd': args.sdmx_dsd,
+        'seed': args.seed,
+    })
+    build = {
+        'workers': args.workers,
+        'worker_type': args.worker_type,
+        'language_workers': args.language_workers,
+        'output_workers': args.output_workers,
+    }
+
+    results = run_benchmark(args.folder, corpus=corpus, build=build, check=not args.no_check)
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
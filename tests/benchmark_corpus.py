@@ -0,0 +1,231 @@
+"""Generate synthetic SDG data/metadata/translations for benchmarking.
+
+The generated folder contains everything needed for open_sdg_check and
+open_sdg_build, including a config.yml file. For example:
+
+    from benchmark_corpus import generate_corpus
+    generate_corpus('_benchmark', indicators=250, disaggregations=4, languages=['en', 'es', 'fr'])
+"""
+
+import os
+import csv
+import json
+import random
+import shutil
+import itertools
+import yaml
+
+# Realistic disaggregations, using SDMX codes, followed by generic ones.
+NAMED_DISAGGREGATIONS = [
+    ('SEX', ['F', 'M']),
+    ('AGE', ['Y0T14', 'Y15T24', 'Y25T64', 'Y_GE65', 'Y0T4', 'Y5T9']),
+    ('URBANISATION', ['U', 'R', 'S']),
+    ('INCOME_WEALTH_QUANTILE', ['Q1', 'Q2', 'Q3', 'Q4', 'Q5']),
+    ('DISABILITY_STATUS', ['PD', 'PWD']),
+]
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    'assets', 'open-sdg', 'metadata_schema.yml')
+
+
+def get_disaggregations(count, values):
+    """Get a pool of disaggregation columns, each with a number of values.
+
+    Parameters
+    ----------
+    count : int
+        The number of disaggregation columns in the pool.
+    values : int
+        The number of values in each column.
+
+    Returns
+    -------
+    list
+        List of (column, list of values) tuples.
+    """
+    pool = []
+    for index in range(count):
+        if index < len(NAMED_DISAGGREGATIONS):
+            column, codes = NAMED_DISAGGREGATIONS[index]
+        else:
+            column, codes = 'DISAGGREGATION_' + str(index + 1), []
+        codes = codes[:values]
+        while len(codes) < values:
+            codes.append(column[:3] + '_' + str(len(codes) + 1))
+        pool.append((column, codes))
+    return pool
+
+
+def get_geocodes(count):
+    """Get a number of synthetic region codes."""
+    return ['G' + str(index + 1).zfill(5) for index in range(count)]
+
+
+def generate_rows(rng, columns, years, sparsity, geocodes):
+    """Generate the data rows for one indicator.
+
+    Every combination of the disaggregation values (including the aggregate,
+    ie, blank) is included, except that non-headline rows are randomly dropped
+    according to the sparsity.
+    """
+    rows = []
+    choices = [[None] + values for _, values in columns]
+    for year in years:
+        for combination in itertools.product(*choices):
+            is_headline = all(value is None for value in combination)
+            if not is_headline and rng.random() < sparsity:
+                continue
+            row = {'Year': year}
+            for (column, _), value in zip(columns, combination):
+                row[column] = value
+            row['Value'] = round(rng.uniform(0, 100), 2)
+            rows.append(row)
+        for geocode in geocodes:
+            rows.append({'Year': year, 'GeoCode': geocode, 'Value': round(rng.uniform(0, 100), 2)})
+    return rows
+
+
+def write_csv(path, rows, columns):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({column: '' if row.get(column) is None else row[column] for column in columns})
+
+
+def write_yaml(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True)
+
+
+def write_geojson(path, geocodes):
+    """Write a GeoJSON file with a small square for each region."""
+    features = []
+    for index, geocode in enumerate(geocodes):
+        x = (index % 100) * 0.1
+        y = (index // 100) * 0.1
+        features.append({
+            'type': 'Feature',
+            'properties': {'id': geocode, 'name': 'Region ' + geocode},
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [[[x, y], [x + 0.1, y], [x + 0.1, y + 0.1], [x, y + 0.1], [x, y]]],
+            },
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f)
+
+
+def generate_corpus(folder, indicators=10, disaggregations=3, values=3,
+                    languages=None, years=5, sparsity=0.2, geocodes=0,
+                    disaggregation_pool=None, sdmx_dsd=None, seed=0):
+    """Generate a synthetic corpus of SDG data, metadata and translations.
+
+    Parameters
+    ----------
+    folder : string
+        The folder to generate the corpus in. Any existing contents are removed.
+    indicators : int
+        The number of indicators.
+    disaggregations : int
+        The number of disaggregation columns per indicator.
+    values : int
+        The number of values in each disaggregation column.
+    languages : list
+        The language codes to translate into. Defaults to ['en'].
+    years : int
+        The number of years of data.
+    sparsity : float
+        The probability (0 to 1) of dropping each disaggregated row.
+    geocodes : int
+        The number of regions (GeoCode values). If above 0, a GeoJSON map
+        layer is also generated.
+    disaggregation_pool : int or None
+        The number of distinct disaggregation columns to choose from. Defaults
+        to twice the number of disaggregations.
+    sdmx_dsd : string or None
+        Path or URL to an SDMX DSD. If specified, SDMX output is also built.
+    seed : int
+        Random seed, so that corpora are reproducible.
+
+    Returns
+    -------
+    dict
+        Statistics about the corpus (indicators, rows, cells).
+    """
+    if languages is None:
+        languages = ['en']
+    if disaggregation_pool is None:
+        disaggregation_pool = max(disaggregations * 2, 1)
+    disaggregation_pool = max(disaggregation_pool, disaggregations)
+    rng = random.Random(seed)
+    shutil.rmtree(folder, ignore_errors=True)
+    for subfolder in ['data', 'meta']:
+        os.makedirs(os.path.join(folder, subfolder))
+
+    pool = get_disaggregations(disaggregation_pool, values)
+    regions = get_geocodes(geocodes)
+    year_list = list(range(2015, 2015 + years))
+    stats = {'indicators': indicators, 'rows': 0, 'cells': 0}
+
+    for index in range(indicators):
+        indicator_id = '{}-{}-{}'.format(index // 100 + 1, (index // 10) % 10 + 1, index % 10 + 1)
+        columns = rng.sample(pool, disaggregations)
+        rows = generate_rows(rng, columns, year_list, sparsity, regions)
+        header = ['Year'] + [column for column, _ in columns] + (['GeoCode'] if regions else []) + ['Value']
+        write_csv(os.path.join(folder, 'data', 'indicator_' + indicator_id + '.csv'), rows, header)
+        stats['rows'] += len(rows)
+        stats['cells'] += len(rows) * len(header)
+
+        meta = {
+            'indicator_name': 'Synthetic indicator ' + indicator_id,
+            'reporting_status': 'complete',
+            'foo': 'Lorem ipsum ' * 20,
+            'page_content': 'Synthetic indicator for benchmarking.',
+        }
+        write_yaml(os.path.join(folder, 'meta', indicator_id + '.yml'), meta)
+        for language in languages[1:]:
+            translated_meta = {'indicator_name': meta['indicator_name'] + ' (' + language + ')'}
+            write_yaml(os.path.join(folder, 'meta', language, indicator_id + '.yml'), translated_meta)
+
+    # Translations of every column and value, into each language.
+    for language in languages:
+        data_group = {}
+        for column, codes in pool:
+            data_group[column] = column.title() + ' (' + language + ')'
+            column_group = {code: code + ' (' + language + ')' for code in codes}
+            write_yaml(os.path.join(folder, 'translations', language, column + '.yml'), column_group)
+        write_yaml(os.path.join(folder, 'translations', language, 'data.yml'), data_group)
+
+    shutil.copy(SCHEMA_PATH, os.path.join(folder, 'metadata_schema.yml'))
+
+    config = {
+        'languages': languages,
+        'src_dir': '',
+        'site_dir': 'site',
+        'schema_file': 'metadata_schema.yml',
+        'inputs': [
+            {'class': 'InputCsvData', 'path_pattern': os.path.join('data', '*.csv')},
+            {'class': 'InputYamlMeta', 'path_pattern': os.path.join('meta', '*.yml'), 'git': False},
+        ],
+        'translations': [
+            {'class': 'TranslationInputYaml', 'source': 'translations'},
+        ],
+        'reporting_status_extra_fields': [],
+        'datapackage': {'sorting': 'default'},
+        'csvw': {'sorting': 'default'},
+        'map_layers': [],
+    }
+    if regions:
+        write_geojson(os.path.join(folder, 'regions.geojson'), regions)
+        config['map_layers'].append({
+            'geojson_file': 'regions.geojson',
+            'name_property': 'name',
+            'id_property': 'id',
+        })
+    if sdmx_dsd is not None:
+        config['sdmx_output'] = {'dsd': sdmx_dsd}
+    write_yaml(os.path.join(folder, 'config.yml'), config)
+
+    return stats
@@ -0,0 +1,31 @@
+import os
+import json
+import pytest
+import benchmark
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not os.environ.get('SDG_BENCHMARK'), reason='Set SDG_BENCHMARK=1 to run the benchmark.')
+def test_benchmark():
+
+    folder = '_site_benchmark'
+    corpus = dict(benchmark.SIZES['toy'])
+    corpus['languages'] = ['en', 'es']
+    results = benchmark.run_benchmark(folder, corpus=corpus)
+
+    assert results['check_status'] == True
+    assert results['build_status'] == True
+    assert set(results['phases'].keys()) == set(['generate', 'check', 'build'])
+    assert results['profile']['categories']['input'] > 0
+    assert 'OutputOpenSdg' in results['profile']['outputs']
+    assert 'OutputGeoJsonOpenSdg' in results['profile']['outputs']
+
+    # The generated data and translations made it into the site.
+    site_dir = os.path.join(folder, 'site')
+    rows = 0
+    for indicator_id in ['1-1-1', '1-1-2', '1-1-3']:
+        with open(os.path.join(site_dir, 'es', 'data', indicator_id + '.json'), encoding='utf-8') as f:
+            data = json.load(f)
+        rows += len(data['Value'])
+        assert any(column.endswith('(es)') for column in data)
+    assert rows == results['corpus_stats']['rows']
+    assert os.path.exists(os.path.join(site_dir, 'es', 'geojson', 'regions', 'indicator_1-1-1.geojson'))
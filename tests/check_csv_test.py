@@ -0,0 +1,20 @@
+import sdg
+import pandas as pd
+
+def test_check_whitespace_in_categorical_columns():
+
+    df = pd.DataFrame({
+        'Year': [2020, 2020, 2021],
+        'SEX': ['F ', ' M', None],
+        'Value': [1.0, 2.0, 3.0],
+    })
+    categorical = df.astype({'SEX': 'category'})
+    for data in [df, categorical]:
+        assert sdg.check_csv.is_string(data['SEX'])
+        assert not sdg.check_csv.check_trailing_whitespace(data, 'test.csv')
+        assert not sdg.check_csv.check_leading_whitespace(data, 'test.csv')
+
+    clean = pd.DataFrame({'Year': [2020], 'SEX': ['F'], 'Value': [1.0]}).astype({'SEX': 'category'})
+    assert sdg.check_csv.check_trailing_whitespace(clean, 'test.csv')
+    assert sdg.check_csv.check_leading_whitespace(clean, 'test.csv')
+    assert not sdg.check_csv.is_string(pd.Series([1, 2], dtype='category'))
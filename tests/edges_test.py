@@ -0,0 +1,48 @@
+import sdg
+import numpy as np
+import pandas as pd
+
+def test_edge_detection():
+
+    data = pd.DataFrame({
+        'Year': [2020] * 5,
+        # AGE is only present when SEX is present, and URBANISATION only when
+        # AGE is present. LOCATION always goes with URBANISATION.
+        'AGE': [None, None, 'Y0T14', 'Y0T14', 'Y15T64'],
+        'SEX': [None, 'F', 'F', 'M', 'F'],
+        'URBANISATION': [None, None, None, 'U', 'R'],
+        'LOCATION': [None, None, None, 'X', 'Y'],
+        'UNITS': [None, 'percent', 'percent', 'percent', 'percent'],
+        'EMPTY': [np.nan] * 5,
+        'Value': [1, 2, 3, 4, 5],
+    })
+    non_disaggregation_columns = ['Year', 'UNITS', 'Value']
+
+    edges = sdg.edges.detect_all_edges('1-1-1', data, non_disaggregation_columns)
+    assert edges.values.tolist() == [
+        ['SEX', 'AGE'],
+        ['AGE', 'URBANISATION'],
+        ['AGE', 'LOCATION'],
+        ['SEX', 'URBANISATION'],
+        ['SEX', 'LOCATION'],
+        ['URBANISATION', 'LOCATION'],
+    ]
+
+    # The grand parents are pruned.
+    edges = sdg.edges.edge_detection('1-1-1', data, non_disaggregation_columns)
+    assert edges.values.tolist() == [
+        ['SEX', 'AGE'],
+        ['AGE', 'URBANISATION'],
+        ['URBANISATION', 'LOCATION'],
+    ]
+
+    # Without any disaggregations there are no edges.
+    edges = sdg.edges.edge_detection('1-1-1', data[['Year', 'Value']], non_disaggregation_columns)
+    assert edges.columns.tolist() == ['From', 'To']
+    assert edges.empty
+
+def test_x_without_y():
+
+    x = pd.Series(['F', 'M', None])
+    assert sdg.edges.x_without_y(x, pd.Series(['Y0T14', None, None]))
+    assert not sdg.edges.x_without_y(x, pd.Series(['Y0T14', 'Y15T64', None]))
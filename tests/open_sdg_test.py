@@ -33,3 +33,92 @@ def test_open_sdg():
     OutputOpenSdg_test.test_open_sdg_output_translations()
     OutputOpenSdg_test.test_open_sdg_output_zip()
     OutputOpenSdg_test.test_open_sdg_output_documentation()
+
+def test_open_sdg_check_and_build():
+
+    def build(alter_meta, site_dir):
+        return sdg.open_sdg_check_and_build(
+            config=os.path.join('tests', 'assets', 'open-sdg', 'nonexistent.yml'),
+            src_dir=os.path.join('tests', 'assets', 'open-sdg'),
+            site_dir=site_dir,
+            schema_file='metadata_schema.yml',
+            languages=['en'],
+            inputs=[
+                {'class': 'InputCsvData', 'path_pattern': 'data/*.csv'},
+                {'class': 'InputYamlMeta', 'path_pattern': 'meta/*.yml', 'git': False},
+            ],
+            translations=[
+                {'class': 'TranslationInputYaml', 'source': os.path.join('..', 'translations', 'yaml')},
+            ],
+            alter_meta=alter_meta,
+        )
+
+    def valid_meta(meta):
+        return meta
+    def invalid_meta(meta):
+        meta['foo'] = ['not', 'text']
+        return meta
+
+    # Nothing should be written if validation fails.
+    assert build(invalid_meta, '_site_check_and_build_invalid') == False
+    assert not os.path.exists('_site_check_and_build_invalid')
+
+    assert build(valid_meta, '_site_check_and_build')
+    assert os.path.isfile(os.path.join('_site_check_and_build', 'en', 'meta', '1-1-1.json'))
+
+def test_open_sdg_stream_languages():
+
+    indicators = []
+    def alter_indicator(indicator, context):
+        indicators.append(indicator)
+        return indicator
+
+    assert sdg.open_sdg_build(
+        config=os.path.join('tests', 'assets', 'open-sdg', 'nonexistent.yml'),
+        src_dir=os.path.join('tests', 'assets', 'open-sdg'),
+        site_dir='_site_stream_languages',
+        schema_file='metadata_schema.yml',
+        languages=['en'],
+        inputs=[
+            {'class': 'InputCsvData', 'path_pattern': 'data/*.csv'},
+            {'class': 'InputYamlMeta', 'path_pattern': 'meta/*.yml', 'git': False},
+        ],
+        translations=[
+            {'class': 'TranslationInputYaml', 'source': os.path.join('..', 'translations', 'yaml')},
+        ],
+        alter_indicator=alter_indicator,
+        stream_languages=True,
+    )
+    for language in ['en', 'untranslated']:
+        assert os.path.isfile(os.path.join('_site_stream_languages', language, 'meta', '1-1-1.json'))
+    # The translated indicators were all forgotten.
+    assert indicators
+    assert all(indicator.translations == {} for indicator in indicators)
+
+def test_open_sdg_indicator_callback_after_outputs():
+
+    site_dir = '_site_indicator_callback'
+    called = []
+    def indicator_callback(indicator):
+        # The callback can alter the indicators, so the other outputs must
+        # already be finished with them.
+        assert os.path.isfile(os.path.join(site_dir, 'en', 'data-packages', '1-1-1', 'datapackage.json'))
+        called.append(indicator)
+
+    assert sdg.open_sdg_build(
+        config=os.path.join('tests', 'assets', 'open-sdg', 'nonexistent.yml'),
+        src_dir=os.path.join('tests', 'assets', 'open-sdg'),
+        site_dir=site_dir,
+        schema_file='metadata_schema.yml',
+        languages=['en'],
+        inputs=[
+            {'class': 'InputCsvData', 'path_pattern': 'data/*.csv'},
+            {'class': 'InputYamlMeta', 'path_pattern': 'meta/*.yml', 'git': False},
+        ],
+        translations=[
+            {'class': 'TranslationInputYaml', 'source': os.path.join('..', 'translations', 'yaml')},
+        ],
+        indicator_callback=indicator_callback,
+        output_workers=2,
+    )
+    assert called